@@ -0,0 +1,56 @@
+"""
+Measures memory use and attribute access time for 10k devices.
+Run from the repository root: python -m benchmarks.bench_devices
+"""
+
+import time
+import tracemalloc
+
+from pyhs3 import simulator as payloads
+from pyhs3.zwave import get_zwave_device
+
+COUNT = 10000
+
+
+def build(status, control, keep_raw):
+    control_data = {item["ref"]: item["ControlPairs"] for item in control["Devices"]}
+    devices = []
+    for raw in status["Devices"]:
+        dev = get_zwave_device(
+            raw, control_data.get(raw["ref"], []), None, keep_raw
+        )
+        if dev is not None:
+            devices.append(dev)
+    return devices
+
+
+def run(keep_raw):
+    tracemalloc.start()
+    status = payloads.getstatus(COUNT)
+    control = payloads.getcontrol(COUNT)
+    devices = build(status, control, keep_raw)
+    # Payloads are released after initialization; only what devices keep remains.
+    del status, control
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(10):
+        for dev in devices:
+            dev.ref, dev.name, dev.status, dev.value
+    elapsed = time.perf_counter() - start
+    reads = len(devices) * 10 * 4
+
+    print(
+        f"keep_raw={keep_raw!s:>5}: {retained / 1024:8.0f} KiB retained, "
+        f"{elapsed / reads * 1e9:.0f} ns/attribute read ({len(devices)} devices)"
+    )
+
+
+def main():
+    run(keep_raw=True)
+    run(keep_raw=False)
+
+
+if __name__ == "__main__":
+    main()
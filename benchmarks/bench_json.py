@@ -0,0 +1,75 @@
+"""
+Compares JSON API response decoding on a large getcontrol payload: the previous
+text() + json() double decode against a single read decoded with json or orjson.
+Pass the path of a recorded JSON response to use it instead of a synthetic one.
+Run from the repository root: python -m benchmarks.bench_json [payload.json]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from aiohttp import ClientSession, web
+
+from pyhs3 import HomeTroller
+from pyhs3 import simulator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ROUNDS = 20
+
+
+async def main(body):
+    async def handler(request):
+        return web.Response(body=body, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/JSON", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    url = f"http://127.0.0.1:{port}/JSON"
+
+    print(f"payload: {len(body) / 1e6:.1f} MB")
+
+    async with ClientSession() as session:
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            async with session.get(url) as result:
+                await result.text()
+                await result.json()
+        report("text() + json()", start)
+
+        decoders = [("json.loads", json.loads)]
+        if orjson is not None:
+            decoders.append(("orjson.loads", orjson.loads))
+        for name, loads in decoders:
+            homeseer = HomeTroller(
+                "127.0.0.1", session, http_port=port, json_loads=loads
+            )
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                await homeseer._request("get", params={"request": "getcontrol"})
+            report(f"read() + {name}", start)
+
+    await runner.cleanup()
+
+
+def report(name, start):
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    print(f"{name:>20}: {elapsed * 1000:.1f} ms per request")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as file:
+            payload = file.read()
+    else:
+        payload = json.dumps(simulator.getcontrol(20000)).encode()
+    asyncio.run(main(payload))
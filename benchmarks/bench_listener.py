@@ -0,0 +1,69 @@
+"""
+Replays an ASCII DC stream through ASCIIListener's read loop.
+Run from the repository root: python -m benchmarks.bench_listener
+"""
+
+import asyncio
+import random
+import time
+
+from pyhs3.const import (
+    OVERFLOW_BACKPRESSURE,
+    OVERFLOW_COALESCE,
+    OVERFLOW_DROP_OLDEST,
+)
+from pyhs3.errors import HomeSeerASCIIConnectionError
+from pyhs3.listener import ASCIIListener
+
+
+def stream(count, refs=1000):
+    lines = []
+    for i in range(count):
+        ref = random.randint(1, refs)
+        lines.append(f"DC,{ref},{i % 100},{(i - 1) % 100}\r\n".encode())
+        if i % 500 == 0:
+            lines.append(b"VR,3.0.0.548\r\n")
+    return b"".join(lines)
+
+
+async def run(data, count, overflow):
+    updates = 0
+
+    async def callback(ref, value):
+        nonlocal updates
+        updates += 1
+
+    listener = ASCIIListener(
+        "localhost", async_message_callback=callback, queue_overflow=overflow
+    )
+    listener._reader = asyncio.StreamReader(limit=2 ** 20)
+    listener._reader.feed_data(data)
+    listener._reader.feed_eof()
+
+    dispatcher = asyncio.get_event_loop().create_task(listener._dispatch_messages())
+
+    start = time.perf_counter()
+    try:
+        await listener._read_messages()
+    except HomeSeerASCIIConnectionError:
+        pass
+    while listener.queue_metrics["depth"]:
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    dispatcher.cancel()
+
+    print(
+        f"{overflow:>12} {count} DC messages: {elapsed * 1000:.1f} ms "
+        f"({count / elapsed:,.0f} msg/s, {updates} callbacks, "
+        f"{listener.queue_metrics})"
+    )
+
+
+async def main():
+    for overflow in (OVERFLOW_BACKPRESSURE, OVERFLOW_COALESCE, OVERFLOW_DROP_OLDEST):
+        for count in (10000, 100000):
+            await run(stream(count), count, overflow)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Load test against the bundled HomeSeer simulator: startup time, DC update
+throughput and end-to-end DC-to-callback latency.
+Run from the repository root: python -m benchmarks.bench_load [devices] [latency]
+"""
+
+import asyncio
+import sys
+import time
+
+from pyhs3 import HomeTroller
+from pyhs3.const import STATE_LISTENING
+from pyhs3.simulator import HomeSeerSimulator
+
+
+async def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        await asyncio.sleep(0.001)
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+async def main(devices, latency):
+    sim = HomeSeerSimulator(devices=devices, latency=latency)
+    await sim.start()
+    homeseer = HomeTroller(
+        "127.0.0.1", http_port=sim.http_port, ascii_port=sim.ascii_port
+    )
+
+    start = time.perf_counter()
+    await homeseer.initialize()
+    elapsed = time.perf_counter() - start
+    timings = ", ".join(
+        f"{request} {seconds * 1000:.1f} ms"
+        for request, seconds in homeseer.initialize_timings.items()
+    )
+    print(
+        f"startup: {elapsed * 1000:.1f} ms for {len(homeseer.devices)} devices "
+        f"({timings})"
+    )
+
+    received = []
+    for device in homeseer.devices.values():
+        device.register_update_callback(
+            lambda ref=device.ref: received.append((ref, time.perf_counter()))
+        )
+
+    await homeseer.start_listener()
+    await wait_for(lambda: homeseer.state == STATE_LISTENING)
+    await asyncio.sleep(0.1)
+
+    refs = list(homeseer.devices)
+    count = 20000
+    start = time.perf_counter()
+    for i in range(count):
+        sim.set_value(refs[i % len(refs)], i % 100)
+    await wait_for(lambda: len(received) >= count, timeout=60)
+    elapsed = time.perf_counter() - start
+    print(
+        f"throughput: {count} updates in {elapsed * 1000:.1f} ms "
+        f"({count / elapsed:,.0f} updates/s)"
+    )
+
+    latencies = []
+    for i in range(500):
+        received.clear()
+        sent = time.perf_counter()
+        sim.set_value(refs[i % len(refs)], i % 100)
+        await wait_for(lambda: received)
+        latencies.append(received[0][1] - sent)
+    print(
+        "DC to callback latency: "
+        + ", ".join(
+            f"p{p} {percentile(latencies, p) * 1e6:.0f} us" for p in (50, 90, 99)
+        )
+    )
+
+    await homeseer.stop_listener()
+    await homeseer.close()
+    await sim.stop()
+
+
+if __name__ == "__main__":
+    devices = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0
+    asyncio.run(main(devices, latency))
@@ -0,0 +1,76 @@
+"""
+Replays a capture (see HomeTroller's capture_path) through a HomeTroller and
+reports update throughput. Without arguments, records a capture from the
+simulator first.
+Run from the repository root: python -m benchmarks.bench_replay [capture] [speed]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from pyhs3 import HomeTroller
+from pyhs3.capture import CaptureReplay
+from pyhs3.const import STATE_LISTENING
+from pyhs3.simulator import HomeSeerSimulator
+
+
+async def record(path, devices=1000, updates=20000):
+    sim = HomeSeerSimulator(devices=devices)
+    await sim.start()
+    homeseer = HomeTroller(
+        "127.0.0.1",
+        http_port=sim.http_port,
+        ascii_port=sim.ascii_port,
+        capture_path=path,
+    )
+    await homeseer.initialize()
+    await homeseer.start_listener()
+    while homeseer.state != STATE_LISTENING:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.1)
+
+    for i in range(updates):
+        sim.set_value(i % devices + 1, i % 100)
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+    await asyncio.sleep(0.5)
+
+    await homeseer.stop_listener()
+    await homeseer.close()
+    await sim.stop()
+
+
+async def main(path, speed):
+    replay = CaptureReplay(path)
+    homeseer = HomeTroller("127.0.0.1", transport=replay.transport)
+    updates = 0
+
+    def count(device, old_value, reason):
+        nonlocal updates
+        updates += 1
+
+    homeseer.add_update_listener(count)
+
+    start = time.perf_counter()
+    await replay.run(homeseer, speed=speed)
+    elapsed = time.perf_counter() - start
+    print(
+        f"replayed {replay.message_count} ASCII messages in {elapsed * 1000:.1f} ms "
+        f"({replay.message_count / elapsed:,.0f} msg/s, {updates} device updates, "
+        f"{len(homeseer.devices)} devices)"
+    )
+
+
+if __name__ == "__main__":
+    speed = float(sys.argv[2]) if len(sys.argv) > 2 else None
+    if len(sys.argv) > 1:
+        asyncio.run(main(sys.argv[1], speed))
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "pyhs3.capture")
+            asyncio.run(record(path))
+            print(f"recorded {os.path.getsize(path) / 1e6:.1f} MB capture")
+            asyncio.run(main(path, speed))
@@ -0,0 +1,81 @@
+"""
+Reconnect soak test against the bundled HomeSeer simulator: drops the ASCII
+connection repeatedly and checks that the number of pyhs3 tasks stays constant.
+Run from the repository root: python -m benchmarks.bench_soak [cycles]
+"""
+
+import asyncio
+import sys
+import time
+
+from pyhs3 import HomeTroller
+from pyhs3.const import STATE_LISTENING
+from pyhs3.simulator import HomeSeerSimulator
+
+
+async def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        await asyncio.sleep(0.001)
+
+
+def pyhs3_tasks():
+    """Count tasks run by the HomeTroller and its listener (not the simulator)."""
+    return sum(
+        1
+        for task in asyncio.all_tasks()
+        if task.get_coro().__qualname__.startswith(("ASCIIListener.", "HomeTroller."))
+    )
+
+
+async def main(cycles):
+    sim = HomeSeerSimulator(devices=10)
+    await sim.start()
+    homeseer = HomeTroller(
+        "127.0.0.1",
+        http_port=sim.http_port,
+        ascii_port=sim.ascii_port,
+        ping_interval=0.02,
+        ping_timeout=0.01,
+    )
+    await homeseer.initialize()
+    baseline = pyhs3_tasks()
+
+    await homeseer.start_listener()
+    await wait_for(lambda: homeseer.state == STATE_LISTENING)
+    await asyncio.sleep(0.05)
+    counts = []
+
+    start = time.perf_counter()
+    for i in range(cycles):
+        reconnects = homeseer.reconnect_metrics["reconnects"]
+        sim.drop_clients()
+        await wait_for(
+            lambda: homeseer.reconnect_metrics["reconnects"] > reconnects
+            and homeseer.state == STATE_LISTENING
+        )
+        # Let the reconnect refresh finish and the new pinger run.
+        await asyncio.sleep(0.005)
+        counts.append(pyhs3_tasks())
+    elapsed = time.perf_counter() - start
+
+    await homeseer.stop_listener()
+    stopped = pyhs3_tasks()
+    print(
+        f"{cycles} reconnects in {elapsed:.1f} s; tasks while listening: "
+        f"min {min(counts)}, max {max(counts)}, first {counts[0]}, last {counts[-1]}"
+    )
+    print(
+        f"tasks before start: {baseline}, after stop: {stopped}, "
+        f"closed: {homeseer._listener.closed}"
+    )
+
+    await homeseer.close()
+    await sim.stop()
+
+
+if __name__ == "__main__":
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    asyncio.run(main(cycles))
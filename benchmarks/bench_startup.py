@@ -0,0 +1,35 @@
+"""
+Times HomeTroller._load_devices against synthetic getstatus/getcontrol payloads.
+Run from the repository root: python -m benchmarks.bench_startup
+"""
+
+import asyncio
+import time
+
+from pyhs3 import HomeTroller
+from pyhs3 import simulator as payloads
+
+
+async def run(count):
+    status = payloads.getstatus(count)
+    control = payloads.getcontrol(count)
+
+    homeseer = HomeTroller("localhost", None)
+
+    start = time.perf_counter()
+    homeseer._load_devices(status, control)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{count:>6} devices: {elapsed * 1000:8.2f} ms "
+        f"({elapsed / count * 1e6:.2f} us/device, {len(homeseer.devices)} supported)"
+    )
+
+
+async def main():
+    for count in (1000, 2500, 5000, 10000):
+        await run(count)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
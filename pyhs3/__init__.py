@@ -1,4 +1,7 @@
 from .hometroller import HomeTroller
+from .manager import HomeTrollerManager
+from .device import HomeSeerDevice, register_device_class
+from .metrics import MetricsHook
 from .const import *
 from .errors import *
 from .helpers import *
@@ -0,0 +1,91 @@
+"""Persistent snapshot of HomeSeer device, control and event data."""
+
+import gzip
+import json
+import os
+import time
+
+from .const import _LOGGER
+
+SNAPSHOT_VERSION = 1
+
+_DEVICE_FIELDS = (
+    "ref",
+    "name",
+    "location",
+    "location2",
+    "device_type_string",
+    "status",
+    "value",
+)
+_CONTROL_PAIR_FIELDS = ("ControlUse", "Label", "ControlValue")
+
+
+def load_snapshot(path, max_age):
+    """
+    Return (getstatus, getcontrol, getevents) payloads from the snapshot at path,
+    or None if there is no usable snapshot younger than max_age seconds.
+    """
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            snapshot = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        _LOGGER.warning(f"Ignoring unreadable HomeSeer snapshot {path}: {err}")
+        return None
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        _LOGGER.debug(f"Ignoring HomeSeer snapshot {path} with old version")
+        return None
+
+    age = time.time() - snapshot["saved"]
+    if age > max_age:
+        _LOGGER.debug(f"Ignoring stale HomeSeer snapshot {path} ({age:.0f}s old)")
+        return None
+
+    return snapshot["getstatus"], snapshot["getcontrol"], snapshot["getevents"]
+
+
+def save_snapshot(path, devices, control_data, events):
+    """
+    Write a snapshot of the given raw getstatus device dicts, their ControlPairs
+    (a dict of ref: pairs) and raw event dicts, keeping only the fields pyhs3 uses.
+    The file is replaced atomically.
+    """
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "saved": time.time(),
+        "getstatus": {
+            "Devices": [
+                {field: device[field] for field in _DEVICE_FIELDS}
+                for device in devices
+            ]
+        },
+        "getcontrol": {
+            "Devices": [
+                {
+                    "ref": device["ref"],
+                    "ControlPairs": [
+                        {field: pair[field] for field in _CONTROL_PAIR_FIELDS}
+                        for pair in control_data[device["ref"]]
+                    ],
+                }
+                for device in devices
+                if device["ref"] in control_data
+            ]
+        },
+        "getevents": {
+            "Events": [
+                {"Group": event["Group"], "Name": event["Name"]} for event in events
+            ]
+        },
+    }
+
+    tmp_path = f"{path}.tmp"
+    try:
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as file:
+            json.dump(snapshot, file, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError as err:
+        _LOGGER.warning(f"Unable to write HomeSeer snapshot {path}: {err}")
@@ -0,0 +1,118 @@
+"""
+Capture of the raw ASCII and JSON API streams to an append-only file, and replay
+of a capture through a HomeTroller for offline analysis.
+
+Each record is a header (timestamp, record type, payload length) followed by the
+payload: the raw ASCII line, or the request type and response body separated by
+a NUL byte.
+"""
+
+import asyncio
+import struct
+import time
+from collections import defaultdict, deque
+
+from .const import _LOGGER
+
+CAPTURE_ASCII = b"A"
+CAPTURE_JSON = b"J"
+
+_HEADER = struct.Struct("<dcI")
+
+
+class CaptureWriter:
+    def __init__(self, path):
+        self._file = open(path, "ab", buffering=1 << 16)
+
+    def write_ascii(self, msg):
+        self._file.write(_HEADER.pack(time.time(), CAPTURE_ASCII, len(msg)) + msg)
+
+    def write_json(self, request_type, body):
+        payload = str(request_type).encode() + b"\0" + body
+        header = _HEADER.pack(time.time(), CAPTURE_JSON, len(payload))
+        self._file.write(header + payload)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def read_capture(path):
+    """Yield (timestamp, record type, payload) for each record in a capture file."""
+    with open(path, "rb") as file:
+        while True:
+            header = file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            timestamp, record_type, length = _HEADER.unpack(header)
+            payload = file.read(length)
+            if len(payload) < length:
+                _LOGGER.warning(f"Truncated record at end of capture {path}")
+                return
+            yield timestamp, record_type, payload
+
+
+class CaptureReplay:
+    """
+    Replays a capture through a HomeTroller created with transport=replay.transport:
+    JSON API requests are answered with the captured responses for the same request
+    type (in order), and ASCII lines are fed through the listener's parsing and
+    dispatch pipeline.
+    """
+
+    def __init__(self, path):
+        self._responses = defaultdict(deque)
+        self._lines = []
+        for timestamp, record_type, payload in read_capture(path):
+            if record_type == CAPTURE_ASCII:
+                self._lines.append((timestamp, payload))
+            elif record_type == CAPTURE_JSON:
+                request_type, body = payload.split(b"\0", 1)
+                self._responses[request_type.decode()].append(body)
+
+    @property
+    def message_count(self):
+        return len(self._lines)
+
+    async def run(self, homeseer, speed=None):
+        """
+        Initialize homeseer from the captured responses and replay the ASCII lines,
+        at speed times real time or as fast as possible if speed is None.
+        Returns once every replayed update has been dispatched.
+        """
+        await homeseer.initialize()
+
+        reader = asyncio.StreamReader()
+        replaying = asyncio.get_event_loop().create_task(homeseer.replay(reader))
+
+        if self._lines:
+            first = self._lines[0][0]
+            start = time.monotonic()
+            for timestamp, msg in self._lines:
+                if speed is not None:
+                    delay = (timestamp - first) / speed - (time.monotonic() - start)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                reader.feed_data(msg)
+                if speed is None:
+                    # Let the listener keep up so the read buffer stays small.
+                    await asyncio.sleep(0)
+        reader.feed_eof()
+        await replaying
+
+    async def transport(self, method, params=None, json=None, raise_errors=False):
+        """
+        HomeTroller transport returning the next captured response body for the
+        request type, or None if there is none (e.g. for commands).
+        """
+        if params is not None:
+            request_type = params.get("request")
+        else:
+            request_type = (json or {}).get("action")
+
+        responses = self._responses.get(request_type)
+        if not responses:
+            return None
+        return responses.popleft()
@@ -0,0 +1,60 @@
+"""Coalescing, concurrency-limited dispatch of controldevicebyvalue commands."""
+
+import asyncio
+
+from .const import _LOGGER
+
+
+class CommandQueue:
+    """
+    Commands for the same ref that are still pending when dispatch begins are
+    coalesced (last write wins); at most max_concurrency commands are in flight.
+    """
+
+    def __init__(self, request, window=0, max_concurrency=4):
+        self._request = request
+        self._window = window
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending = {}
+        self._tasks = set()
+
+    def submit(self, ref, value):
+        """
+        Queue a command and return a future that resolves to True once it has been
+        sent, or False if it was superseded by a later command for the same ref.
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+
+        if ref in self._pending:
+            _, superseded = self._pending[ref]
+            _LOGGER.debug("HomeSeer command for %s superseded by value %s", ref, value)
+            # The superseded caller may already have cancelled or timed out.
+            if not superseded.done():
+                superseded.set_result(False)
+        else:
+            task = loop.create_task(self._dispatch(ref))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        self._pending[ref] = (value, future)
+        return future
+
+    async def _dispatch(self, ref):
+        if self._window:
+            await asyncio.sleep(self._window)
+
+        async with self._semaphore:
+            value, future = self._pending.pop(ref)
+            params = {"request": "controldevicebyvalue", "ref": ref, "value": value}
+            try:
+                await self._request("get", params=params)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as err:
+                if not future.done():
+                    future.set_exception(err)
+            else:
+                if not future.done():
+                    future.set_result(True)
@@ -24,8 +24,15 @@ DEVICE_ZWAVE_SWITCH_BINARY = "Z-Wave Switch Binary"
 DEVICE_ZWAVE_SWITCH_MULTILEVEL = "Z-Wave Switch Multilevel"
 DEVICE_ZWAVE_TEMPERATURE = "Z-Wave Temperature"
 
+OVERFLOW_BACKPRESSURE = "backpressure"
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+
 REASON_DISCONNECTED = "disconnected"
+REASON_OPTIMISTIC = "optimistic"
+REASON_RECONCILED = "reconciled"
 REASON_RECONNECTED = "reconnected"
+REASON_ROLLED_BACK = "rolled_back"
 
 STATE_CLOSED = "closed"
 STATE_CLOSING = "closing"
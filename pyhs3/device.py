@@ -1,78 +1,182 @@
 """Models the basic API data for a HomeSeer device."""
 
 from .const import (
+    HS_UNIT_CELSIUS,
+    HS_UNIT_FAHRENHEIT,
+    HS_UNIT_LUX,
+    HS_UNIT_PERCENTAGE,
     REASON_DISCONNECTED,
     REASON_RECONNECTED,
 )
 
 
+_DEVICE_CLASSES = {}
+_UNPARSED = object()
+
+
+def register_device_class(device_type_string, device_class):
+    """
+    Register a HomeSeerDevice subclass to be used for devices of device_type_string.
+    Replaces any class previously registered for that type.
+    """
+    _DEVICE_CLASSES[device_type_string] = device_class
+
+
+def get_device(raw, control_data, request, keep_raw=True):
+    """Return a device object for raw, or None if its type is not registered."""
+    device_class = _DEVICE_CLASSES.get(raw["device_type_string"])
+    if device_class is None:
+        return None
+    return device_class(raw, control_data, request, keep_raw)
+
+
+def _parse_value(value):
+    """Return value as an int or float, or unchanged if it is not numeric."""
+    try:
+        if "." in str(value):
+            return float(value)
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _parse_uom(status):
+    if "Lux" in status:
+        return HS_UNIT_LUX
+    if "%" in status:
+        return HS_UNIT_PERCENTAGE
+    if "F" in status:
+        return HS_UNIT_FAHRENHEIT
+    if "C" in status:
+        return HS_UNIT_CELSIUS
+    return None
+
+
 class HomeSeerDevice:
     """Do not use this class directly, subclass it."""
 
-    def __init__(self, raw, control_data, request):
-        self._raw = raw
-        self._control_data = control_data
+    __slots__ = (
+        "_raw",
+        "_request",
+        "_ref",
+        "_name",
+        "_location",
+        "_location2",
+        "_device_type_string",
+        "_status",
+        "_value",
+        "_uom",
+        "_on_value",
+        "_off_value",
+        "_lock_value",
+        "_unlock_value",
+        "_value_update_callback",
+        "_suppress_value_update_callback",
+    )
+
+    def __init__(self, raw, control_data, request, keep_raw=True):
+        """
+        control_data is the list of ControlPairs belonging to this device
+        (see HomeTroller._load_devices), not the full getcontrol payload.
+        The fields used are parsed from raw up front; raw itself is only
+        retained if keep_raw is True.
+        """
+        self._raw = raw if keep_raw else None
         self._request = request
-        self._value = self._raw["value"]
-        self._on_value = None
-        self._off_value = None
-        self._lock_value = None
-        self._unlock_value = None
+        self._ref = raw["ref"]
+        self._name = raw["name"]
+        self._location = raw["location"]
+        self._location2 = raw["location2"]
+        self._device_type_string = raw["device_type_string"]
+        self._status = raw["status"]
+        self._value = _parse_value(raw["value"])
+        self._uom = _UNPARSED
         self._value_update_callback = None
         self._suppress_value_update_callback = False
-        self._get_control_values()
+        self._get_control_values(control_data)
 
     @property
     def ref(self):
-        return self._raw["ref"]
+        return self._ref
 
     @property
     def name(self):
-        return self._raw["name"]
+        return self._name
 
     @property
     def location(self):
-        return self._raw["location"]
+        return self._location
 
     @property
     def location2(self):
-        return self._raw["location2"]
+        return self._location2
 
     @property
     def value(self):
         """Return int or float device value as appropriate."""
-        if "." in str(self._value):
-            return float(self._value)
-        return int(self._value)
+        return self._value
 
     @property
     def device_type_string(self):
-        return self._raw["device_type_string"]
+        return self._device_type_string
 
     @property
     def status(self):
-        return self._raw["status"]
-
-    def _get_control_values(self):
-        for item in self._control_data:
-            if item["ref"] == self.ref:
-                control_pairs = item["ControlPairs"]
-                for pair in control_pairs:
-                    control_use = pair["ControlUse"]
-                    control_label = pair["Label"]
-                    if control_use == 1:
-                        self._on_value = pair["ControlValue"]
-                    elif control_use == 2:
-                        self._off_value = pair["ControlValue"]
-                    elif control_use == 18:
-                        self._lock_value = pair["ControlValue"]
-                    elif control_use == 19:
-                        self._unlock_value = pair["ControlValue"]
-                    elif control_label == "Lock":
-                        self._lock_value = pair["ControlValue"]
-                    elif control_label == "Unlock":
-                        self._unlock_value = pair["ControlValue"]
-                break
+        return self._status
+
+    @property
+    def uom(self):
+        """
+        Return the unit of measure parsed from status, or None if there is none.
+        Parsed once and cached until the status changes.
+        """
+        if self._uom is _UNPARSED:
+            self._uom = _parse_uom(self._status)
+        return self._uom
+
+    def _get_control_values(self, control_data):
+        self._on_value = None
+        self._off_value = None
+        self._lock_value = None
+        self._unlock_value = None
+        for pair in control_data:
+            control_use = pair["ControlUse"]
+            control_label = pair["Label"]
+            if control_use == 1:
+                self._on_value = pair["ControlValue"]
+            elif control_use == 2:
+                self._off_value = pair["ControlValue"]
+            elif control_use == 18:
+                self._lock_value = pair["ControlValue"]
+            elif control_use == 19:
+                self._unlock_value = pair["ControlValue"]
+            elif control_label == "Lock":
+                self._lock_value = pair["ControlValue"]
+            elif control_label == "Unlock":
+                self._unlock_value = pair["ControlValue"]
+
+    def matches(self, raw):
+        """Return True if raw getstatus data matches this device's identity and type."""
+        return (
+            raw["ref"] == self._ref
+            and raw["name"] == self._name
+            and raw["location"] == self._location
+            and raw["location2"] == self._location2
+            and raw["device_type_string"] == self._device_type_string
+        )
+
+    def _update_identity(self, raw):
+        """Take the name and locations from raw getstatus data for the same device."""
+        if self._raw is not None:
+            self._raw = raw
+        self._name = raw["name"]
+        self._location = raw["location"]
+        self._location2 = raw["location2"]
+
+    def _take_callback(self, other):
+        """Take over the update callback registered on other, which replaces self."""
+        self._value_update_callback = other._value_update_callback
+        self._suppress_value_update_callback = other._suppress_value_update_callback
 
     def register_update_callback(self, callback, suppress_on_reconnect=False):
         self._suppress_value_update_callback = suppress_on_reconnect
@@ -80,7 +184,7 @@ class HomeSeerDevice:
 
     def update_value(self, value, reason=None):
         if value is not None:
-            self._value = value
+            self._value = _parse_value(value)
 
         if reason == REASON_RECONNECTED and self._suppress_value_update_callback:
             return
@@ -88,3 +192,16 @@ class HomeSeerDevice:
             return
         elif self._value_update_callback is not None:
             self._value_update_callback()
+
+    def refresh(self, value, status, reason=None):
+        """
+        Update value and status from a getstatus refresh.
+        The update callback is only fired (and True returned) if either has changed.
+        """
+        if self._value == _parse_value(value) and self._status == status:
+            return False
+        if self._status != status:
+            self._status = status
+            self._uom = _UNPARSED
+        self.update_value(value, reason)
+        return True
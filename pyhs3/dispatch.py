@@ -0,0 +1,102 @@
+"""Bounded queue decoupling ASCII socket reads from device update callbacks."""
+
+import asyncio
+from collections import deque
+
+from .const import (
+    OVERFLOW_BACKPRESSURE,
+    OVERFLOW_COALESCE,
+    OVERFLOW_DROP_OLDEST,
+)
+
+
+class UpdateQueue:
+    """
+    Holds (ref, value) updates between the listener's reader and dispatcher.
+    When full, put() either waits (OVERFLOW_BACKPRESSURE) or discards the oldest
+    update (OVERFLOW_DROP_OLDEST). With OVERFLOW_COALESCE, a queued update for a ref
+    is replaced by newer values for the same ref, and put() waits only if the queue
+    is full of distinct refs.
+    """
+
+    def __init__(self, maxsize=1000, overflow=OVERFLOW_BACKPRESSURE):
+        if overflow not in (
+            OVERFLOW_BACKPRESSURE,
+            OVERFLOW_COALESCE,
+            OVERFLOW_DROP_OLDEST,
+        ):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._items = {} if overflow == OVERFLOW_COALESCE else deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._finished.set()
+        self._unfinished = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    async def put(self, ref, value):
+        if self._overflow == OVERFLOW_COALESCE:
+            if ref in self._items:
+                self._items[ref] = value
+                self.coalesced += 1
+                return
+        while len(self._items) >= self._maxsize:
+            if self._overflow == OVERFLOW_DROP_OLDEST:
+                self._items.popleft()
+                self.dropped += 1
+                self._unfinished -= 1
+            else:
+                self._not_full.clear()
+                await self._not_full.wait()
+
+        if self._overflow == OVERFLOW_COALESCE:
+            self._items[ref] = value
+        else:
+            self._items.append((ref, value))
+        self._unfinished += 1
+        self._finished.clear()
+        self._not_empty.set()
+
+    async def get(self):
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        if self._overflow == OVERFLOW_COALESCE:
+            ref = next(iter(self._items))
+            item = ref, self._items.pop(ref)
+        else:
+            item = self._items.popleft()
+        self._not_full.set()
+        return item
+
+    def clear(self):
+        """Discard every queued update, e.g. ones superseded by a refresh."""
+        self._unfinished -= len(self._items)
+        self._items.clear()
+        self._not_full.set()
+        if self._unfinished == 0:
+            self._finished.set()
+
+    def task_done(self):
+        """Mark an update returned by get() as processed, see join()."""
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self):
+        """Wait until every queued update has been got and marked done."""
+        await self._finished.wait()
+
+    def as_dict(self):
+        return {
+            "depth": len(self._items),
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
@@ -1,5 +1,11 @@
 """Models a HomeSeer event"""
 
+from collections import namedtuple
+
+EventResult = namedtuple(
+    "EventResult", ["group", "name", "success", "latency", "error"]
+)
+
 
 class HomeSeerEvent:
     def __init__(self, raw, request):
@@ -14,19 +14,15 @@ from .const import (
     DEVICE_ZWAVE_SWITCH_BINARY,
     DEVICE_ZWAVE_SWITCH_MULTILEVEL,
     DEVICE_ZWAVE_TEMPERATURE,
-    HS_UNIT_CELSIUS,
-    HS_UNIT_FAHRENHEIT,
-    HS_UNIT_LUX,
-    HS_UNIT_PERCENTAGE,
 )
 from .device import HomeSeerDevice
 
-HASS_BINARY_SENSORS = [DEVICE_ZWAVE_SENSOR_BINARY]
-HASS_COVERS = [DEVICE_ZWAVE_BARRIER_OPERATOR]
-HASS_EVENTS = [DEVICE_ZWAVE_CENTRAL_SCENE]
-HASS_LIGHTS = [DEVICE_ZWAVE_SWITCH_MULTILEVEL]
-HASS_LOCKS = [DEVICE_ZWAVE_DOOR_LOCK]
-HASS_SENSORS = [
+HASS_BINARY_SENSORS = frozenset([DEVICE_ZWAVE_SENSOR_BINARY])
+HASS_COVERS = frozenset([DEVICE_ZWAVE_BARRIER_OPERATOR])
+HASS_EVENTS = frozenset([DEVICE_ZWAVE_CENTRAL_SCENE])
+HASS_LIGHTS = frozenset([DEVICE_ZWAVE_SWITCH_MULTILEVEL])
+HASS_LOCKS = frozenset([DEVICE_ZWAVE_DOOR_LOCK])
+HASS_SENSORS = frozenset([
     DEVICE_ZWAVE_BATTERY,
     DEVICE_ZWAVE_FAN_STATE,
     DEVICE_ZWAVE_LUMINANCE,
@@ -34,21 +30,38 @@ HASS_SENSORS = [
     DEVICE_ZWAVE_OPERATING_STATE,
     DEVICE_ZWAVE_RELATIVE_HUMIDITY,
     DEVICE_ZWAVE_SENSOR_MULTILEVEL
-]
-HASS_SWITCHES = [DEVICE_ZWAVE_SWITCH, DEVICE_ZWAVE_SWITCH_BINARY]
+])
+HASS_SWITCHES = frozenset([DEVICE_ZWAVE_SWITCH, DEVICE_ZWAVE_SWITCH_BINARY])
 
+HASS_PLATFORMS = {
+    **dict.fromkeys(HASS_BINARY_SENSORS, "binary_sensor"),
+    **dict.fromkeys(HASS_COVERS, "cover"),
+    **dict.fromkeys(HASS_EVENTS, "event"),
+    **dict.fromkeys(HASS_LIGHTS, "light"),
+    **dict.fromkeys(HASS_LOCKS, "lock"),
+    **dict.fromkeys(HASS_SENSORS, "sensor"),
+    **dict.fromkeys(HASS_SWITCHES, "switch"),
+}
 
-async def parse_uom(device: HomeSeerDevice):
+
+def get_platform(device: HomeSeerDevice):
+    """
+    Returns the Home Assistant platform for a device
+    (e.g. "light", see HASS_PLATFORMS), or None if it has none.
+    """
+    return HASS_PLATFORMS.get(device.device_type_string)
+
+
+def get_uom(device: HomeSeerDevice):
     """
     Parses the status property of a device object to return a unit of measure,
     or none if no unit can be parsed.
+    The result is cached on the device until its status changes (see
+    HomeSeerDevice.uom).
     """
-    if "Lux" in device.status:
-        return HS_UNIT_LUX
-    if "%" in device.status:
-        return HS_UNIT_PERCENTAGE
-    if "F" in device.status:
-        return HS_UNIT_FAHRENHEIT
-    if "C" in device.status:
-        return HS_UNIT_CELSIUS
-    return None
+    return device.uom
+
+
+async def parse_uom(device: HomeSeerDevice):
+    """Coroutine version of get_uom, kept for compatibility."""
+    return device.uom
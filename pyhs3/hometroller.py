@@ -3,8 +3,12 @@ Models a connection to a HomeSeer HomeTroller (or independent HomeSeer HS3 softw
 Allows sending commands via JSON API and listening for device changes via ASCII interface.
 """
 
+import asyncio
+import logging
+import time
+from collections import Counter, defaultdict
 from asyncio import TimeoutError
-from aiohttp import BasicAuth, ContentTypeError
+from aiohttp import BasicAuth, ClientSession, TCPConnector
 from typing import Union
 
 from .const import (
@@ -13,27 +17,115 @@ from .const import (
     DEFAULT_HTTP_PORT,
     DEFAULT_PASSWORD,
     DEFAULT_USERNAME,
+    OVERFLOW_BACKPRESSURE,
     REASON_DISCONNECTED,
+    REASON_OPTIMISTIC,
+    REASON_RECONCILED,
+    REASON_RECONNECTED,
+    REASON_ROLLED_BACK,
     STATE_IDLE,
+    STATE_LISTENING,
     STATE_STOPPED,
 )
-from .events import HomeSeerEvent
-from .listener import ASCIIListener
-from .zwave import get_zwave_device
+from .cache import load_snapshot, save_snapshot
+from .capture import CaptureWriter
+from .commands import CommandQueue
+from .errors import HomeSeerError
+from .events import EventResult, HomeSeerEvent
+from .listener import ASCIIListener, _wait_cancelled
+from .metrics import CommandMetrics, RequestMetrics
+from .subscription import DeviceUpdate, Subscription
+from .device import _parse_value, get_device
+from . import zwave  # noqa: F401 - registers the Z-Wave device classes
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 
 class HomeTroller:
     def __init__(
         self,
         host,
-        websession,
+        websession=None,
         username=DEFAULT_USERNAME,
         password=DEFAULT_PASSWORD,
         http_port=DEFAULT_HTTP_PORT,
         ascii_port=DEFAULT_ASCII_PORT,
+        command_window=0,
+        command_concurrency=4,
+        max_requests=4,
+        keepalive_timeout=30,
+        queue_size=1000,
+        queue_overflow=OVERFLOW_BACKPRESSURE,
+        coalesce_window=0,
+        coalesce_windows=None,
+        keep_raw=True,
+        reconnect_delay=1,
+        reconnect_max_delay=60,
+        ping_interval=30,
+        ping_timeout=10,
+        cache_path=None,
+        cache_max_age=86400,
+        json_loads=json_loads,
+        reconcile_min_interval=None,
+        reconcile_max_interval=600,
+        metrics=None,
+        capture_path=None,
+        optimistic_timeout=None,
+        transport=None,
     ):
+        """
+        If websession is None, HomeTroller creates (and closes, see close()) its own
+        session limited to max_requests connections kept alive for keepalive_timeout.
+        At most max_requests JSON API requests are in flight at once either way.
+
+        coalesce_window (seconds) limits ASCII updates delivered per device to one per
+        window, always delivering the latest value; coalesce_windows overrides it per
+        device type, e.g. {DEVICE_ZWAVE_SENSOR_MULTILEVEL: 1}.
+
+        keep_raw=False discards each device's raw getstatus data once parsed.
+
+        The ASCII listener reconnects immediately after a disconnect, then backs off
+        exponentially from reconnect_delay up to reconnect_max_delay seconds.
+        It pings the HomeTroller every ping_interval seconds and reconnects if
+        nothing is received within ping_timeout seconds of a ping.
+
+        JSON API responses are decoded with json_loads: orjson.loads if orjson is
+        installed, otherwise json.loads.
+
+        If reconcile_min_interval is set, getstatus is also polled while listening,
+        backing off to reconcile_max_interval seconds while no drift is detected;
+        drift_counts counts corrected devices by device type.
+
+        metrics may be a MetricsHook, which is called from the request and ASCII
+        message hot paths.
+
+        If capture_path is set, raw ASCII lines and JSON API responses are appended
+        to it for later replay (see capture.CaptureReplay).
+
+        If optimistic_timeout is set, device commands update the device's value
+        immediately (reason REASON_OPTIMISTIC). A DC update or refresh reporting
+        that value confirms it, a DC update with another value replaces it, and if
+        neither arrives within optimistic_timeout seconds the previous value is
+        restored (reason REASON_ROLLED_BACK).
+        See command_metrics for confirmation latencies per device type.
+
+        transport replaces HTTP for JSON API requests: an async callable taking
+        (method, params=None, json=None, raise_errors=False) and returning the raw
+        response body, or None on error (e.g. capture.CaptureReplay.transport).
+        """
         self._host = host
         self._websession = websession
+        self._owns_websession = False
+        self._max_requests = max_requests
+        self._keepalive_timeout = keepalive_timeout
+        self._semaphore = asyncio.Semaphore(max_requests)
+        self._metrics = RequestMetrics()
+        self._hook = metrics
+        self._transport = transport or self._http_request
+        self._capture = CaptureWriter(capture_path) if capture_path else None
         self._auth = BasicAuth(username, password)
         self._http_port = http_port
         self._ascii_port = ascii_port
@@ -45,115 +137,724 @@ class HomeTroller:
             async_message_callback=self._update_device_value,
             async_connection_callback=self.refresh_devices,
             async_disconnection_callback=self._disconnect_callback,
+            queue_size=queue_size,
+            queue_overflow=queue_overflow,
+            reconnect_delay=reconnect_delay,
+            reconnect_max_delay=reconnect_max_delay,
+            ping_interval=ping_interval,
+            ping_timeout=ping_timeout,
+            metrics=metrics,
+            capture=self._capture,
+        )
+        self._commands = CommandQueue(
+            self._request, window=command_window, max_concurrency=command_concurrency
         )
+        self._keep_raw = keep_raw
+        self._coalesce_window = coalesce_window
+        self._coalesce_windows = coalesce_windows or {}
+        self._coalesce_timers = {}
+        self._coalesce_pending = {}
+        self._update_listeners = []
+        self._ref_subscriptions = defaultdict(set)
+        self._type_subscriptions = defaultdict(set)
+        self._all_subscriptions = set()
+        self._json_loads = json_loads
+        self._cache_path = cache_path
+        self._cache_max_age = cache_max_age
+        self._cache_refresh = None
+        self._refresh_batches = {}
+        self._reconcile_min_interval = reconcile_min_interval
+        self._reconcile_max_interval = reconcile_max_interval
+        self._reconciler = None
+        self._refresh_tasks = set()
+        self._disconnect_notified = False
+        self._update_sequence = 0
+        self._last_updates = {}
+        self._optimistic_timeout = optimistic_timeout
+        self._optimistic = {}
+        self._command_metrics = CommandMetrics()
         self.devices = {}
         self.events = []
+        self._events_index = {}
+        self.unsupported_device_types = Counter()
+        self.initialize_timings = {}
+        self.loaded_from_cache = False
+        self.drift_counts = Counter()
 
     @property
     def state(self):
         return self._listener.state
 
+    @property
+    def request_metrics(self):
+        """Return JSON API queue depth, in-flight count and latency percentiles."""
+        return self._metrics.as_dict()
+
+    @property
+    def command_metrics(self):
+        """Optimistic command confirmations, timeouts and latency by device type."""
+        return self._command_metrics.as_dict()
+
+    @property
+    def update_queue_metrics(self):
+        """Return ASCII update queue depth and dropped/coalesced message counts."""
+        return self._listener.queue_metrics
+
+    @property
+    def reconnect_metrics(self):
+        """Return ASCII listener reconnection attempt count and time to reconnect."""
+        return self._listener.reconnect_metrics
+
+    @property
+    def ping_metrics(self):
+        """Return ASCII listener ping round trip time and ping timeout count."""
+        return self._listener.ping_metrics
+
     async def initialize(self):
-        await self._get_devices()
-        await self._get_events()
+        """
+        Fetch devices, controls and events concurrently.
+        A failed events request does not prevent devices from loading (and vice versa).
+
+        If cache_path is set and holds a snapshot younger than cache_max_age, devices
+        and events are loaded from it immediately and refreshed from the HomeTroller
+        in the background; the snapshot is rewritten after every successful fetch.
+        """
+        if self._cache_path is not None:
+            snapshot = await asyncio.get_event_loop().run_in_executor(
+                None, load_snapshot, self._cache_path, self._cache_max_age
+            )
+            if snapshot is not None:
+                status, control, events = snapshot
+                self._load_devices(status, control)
+                self._load_events(events)
+                self.loaded_from_cache = True
+                _LOGGER.debug(
+                    f"HomeSeer loaded {len(self.devices)} devices "
+                    f"from {self._cache_path}"
+                )
+                self._cache_refresh = asyncio.get_event_loop().create_task(
+                    self._fetch_all()
+                )
+                self._cache_refresh.add_done_callback(self._cache_refresh_done)
+                return
+
+        await self._fetch_all()
+
+    def _cache_refresh_done(self, task):
+        if not task.cancelled() and task.exception() is not None:
+            _LOGGER.error(f"HomeSeer background refresh error: {task.exception()}")
+
+    async def _cancel_cache_refresh(self):
+        task, self._cache_refresh = self._cache_refresh, None
+        if task is not None:
+            task.cancel()
+            await _wait_cancelled(task)
+
+    async def _fetch_all(self):
+        status, control, events = await asyncio.gather(
+            self._timed_request("getstatus"),
+            self._timed_request("getcontrol"),
+            self._timed_request("getevents"),
+        )
+        devices_loaded = self._load_devices(status, control)
+        events_loaded = self._load_events(events)
+
+        if self._cache_path is not None and devices_loaded and events_loaded:
+            devices = [
+                device for device in status["Devices"] if device["ref"] in self.devices
+            ]
+            control_data = {
+                item["ref"]: item["ControlPairs"] for item in control["Devices"]
+            }
+            await asyncio.get_event_loop().run_in_executor(
+                None,
+                save_snapshot,
+                self._cache_path,
+                devices,
+                control_data,
+                events["Events"],
+            )
 
     async def start_listener(self):
         self._listener.state = STATE_IDLE
         await self._listener.connection_handler()
+        if self._reconcile_min_interval and self._reconciler is None:
+            self._reconciler = asyncio.get_event_loop().create_task(self._reconcile())
 
     async def stop_listener(self):
+        """Stop the ASCII listener; returns once all of its tasks have finished."""
         self._listener.state = STATE_STOPPED
         await self._listener.connection_handler()
+        if self._reconciler is not None:
+            self._reconciler.cancel()
+            await _wait_cancelled(self._reconciler)
+            self._reconciler = None
+        await self._cancel_cache_refresh()
+        self._cancel_coalesced()
+        for pending in self._optimistic.values():
+            pending[3].cancel()
+        self._optimistic.clear()
+
+    async def wait_closed(self):
+        """Wait until the ASCII listener has been stopped."""
+        await self._listener.wait_closed()
+
+    async def replay(self, reader):
+        """
+        Feed ASCII lines from reader (an asyncio.StreamReader) through the update
+        pipeline until EOF, without connecting; see capture.CaptureReplay.
+        """
+        await self._listener.replay(reader)
+
+    async def _reconcile(self):
+        """
+        Poll getstatus while listening to catch updates missed by the ASCII listener.
+        The interval doubles (up to reconcile_max_interval) while no drift is found
+        and drops back to reconcile_min_interval when it is.
+        """
+        interval = self._reconcile_min_interval
+        while True:
+            await asyncio.sleep(interval)
+            if self.state != STATE_LISTENING:
+                continue
+
+            changed = await self.refresh_devices(reason=REASON_RECONCILED)
+            if changed is None:
+                continue
+
+            # Status text changes along with values delivered over DC, so only a
+            # different value counts as drift.
+            drifted = [
+                ref
+                for ref, (old_value, new_value) in changed.items()
+                if old_value != new_value
+            ]
+            if drifted:
+                for ref in drifted:
+                    device = self.devices.get(ref)
+                    if device is not None:
+                        self.drift_counts[device.device_type_string] += 1
+                _LOGGER.info(
+                    "HomeSeer reconciliation corrected %s devices", len(drifted)
+                )
+                interval = self._reconcile_min_interval
+            else:
+                interval = min(interval * 2, self._reconcile_max_interval)
+
+    async def close(self):
+        """Close the capture file, and the HTTP session if this HomeTroller made it."""
+        await self._cancel_cache_refresh()
+        if self._capture is not None:
+            self._capture.close()
+            self._capture = None
+        if self._owns_websession:
+            await self._websession.close()
+            self._websession = None
+            self._owns_websession = False
 
     async def control_device_by_value(self, ref: int, value: Union[str, int, float]):
         """
         Provides an interface for controlling devices by value
         directly through the HomeTroller object.
+        Commands are sent through the command queue: returns True once sent,
+        or False if superseded by a later command for the same ref.
         """
-        params = {
-            "request": "controldevicebyvalue",
-            "ref": ref,
-            "value": value,
-        }
-        await self._request("get", params=params)
+        return await self._send_command(ref, value)
+
+    async def _device_request(self, method, params=None, json=None):
+        """Request function given to devices; routes commands via the command queue."""
+        if params is not None and params.get("request") == "controldevicebyvalue":
+            return await self._send_command(params["ref"], params["value"])
+        return await self._request(method, params=params, json=json)
+
+    async def _send_command(self, ref, value):
+        device = self.devices.get(ref)
+        if self._optimistic_timeout is None or device is None:
+            return await self._commands.submit(ref, value)
 
-    async def _request(self, method, params=None, json=None):
-        """Make an API request"""
+        self._set_optimistic(device, value)
+        try:
+            return await self._commands.submit(ref, value)
+        except Exception:
+            self._rollback_optimistic(ref, timed_out=False)
+            raise
+
+    def _set_optimistic(self, device, value):
+        """Apply value to device until confirmed by a DC update or rolled back."""
+        ref = device.ref
+        old_value = device.value
+        pending = self._optimistic.pop(ref, None)
+        if pending is None:
+            rollback_value = old_value
+        else:
+            # Keep the last confirmed value when a command supersedes another.
+            rollback_value = pending[1]
+            pending[3].cancel()
+
+        device.update_value(value, REASON_OPTIMISTIC)
+        timer = asyncio.get_event_loop().call_later(
+            self._optimistic_timeout, self._rollback_optimistic, ref
+        )
+        self._optimistic[ref] = (device.value, rollback_value, time.monotonic(), timer)
+        self._notify_update(device, old_value, REASON_OPTIMISTIC)
+
+    def _confirm_optimistic(self, device, value, resolve_mismatch=True):
+        """
+        Resolve the pending command for device with a reported value.
+        Returns True if value confirms the command and is still the device's value,
+        so needs no update. Otherwise a different value is counted as mismatched and
+        resolves the command, or leaves it pending if resolve_mismatch is False.
+        """
+        optimistic_value, _, sent, timer = self._optimistic[device.ref]
+        if _parse_value(value) != optimistic_value:
+            if resolve_mismatch:
+                del self._optimistic[device.ref]
+                timer.cancel()
+                self._command_metrics.mismatched[device.device_type_string] += 1
+                if self._hook is not None:
+                    self._hook.command_mismatched(device.device_type_string)
+            return False
+
+        del self._optimistic[device.ref]
+        timer.cancel()
+        latency = time.monotonic() - sent
+        self._command_metrics.record(device.device_type_string, latency)
+        if self._hook is not None:
+            self._hook.command_confirmed(device.device_type_string, latency)
+        return device.value == optimistic_value
+
+    def _rollback_optimistic(self, ref, timed_out=True):
+        pending = self._optimistic.pop(ref, None)
+        if pending is None:
+            # Already resolved by a DC update or superseded by a newer command.
+            return
+        optimistic_value, rollback_value, _, timer = pending
+        timer.cancel()
+        device = self.devices.get(ref)
+        if device is None:
+            return
+        if timed_out:
+            self._command_metrics.timed_out[device.device_type_string] += 1
+            if self._hook is not None:
+                self._hook.command_timed_out(device.device_type_string)
+        # Leave the value alone if something else (e.g. a refresh) has changed it.
+        if device.value != optimistic_value:
+            return
+
+        _LOGGER.debug(
+            "HomeSeer command for %s not confirmed, restoring value %s",
+            ref,
+            rollback_value,
+        )
+        device.update_value(rollback_value, REASON_ROLLED_BACK)
+        self._notify_update(device, optimistic_value, REASON_ROLLED_BACK)
+
+    async def _request(self, method, params=None, json=None, raise_errors=False):
+        """Make an API request, waiting for a free slot if max_requests are in flight"""
+        if params is not None:
+            request_type = params.get("request")
+        else:
+            request_type = (json or {}).get("action")
+
+        self._metrics.queued += 1
+        if self._hook is not None:
+            self._hook.request_queue_depth(self._metrics.queued)
+        async with self._semaphore:
+            self._metrics.queued -= 1
+            self._metrics.in_flight += 1
+            start = time.monotonic()
+            try:
+                body = await self._transport(
+                    method, params=params, json=json, raise_errors=raise_errors
+                )
+            finally:
+                latency = time.monotonic() - start
+                self._metrics.in_flight -= 1
+                self._metrics.record(request_type, latency)
+                if self._hook is not None:
+                    self._hook.request_completed(request_type, latency)
+
+        if body is None:
+            return None
+        if self._capture is not None:
+            self._capture.write_json(request_type, body)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "HomeSeer request response: %s", body.decode(errors="replace")
+            )
+        try:
+            return self._json_loads(body)
+        except ValueError:
+            _LOGGER.debug("HomeSeer returned non-JSON response: %s", body)
+            return None
+
+    async def _http_request(self, method, params=None, json=None, raise_errors=False):
+        """
+        Returns the raw response body. Request errors are logged and return None,
+        or raise HomeSeerError if raise_errors is True.
+        """
         url = f"http://{self._host}:{self._http_port}/JSON"
 
+        if self._websession is None:
+            self._websession = ClientSession(
+                connector=TCPConnector(
+                    limit=self._max_requests, keepalive_timeout=self._keepalive_timeout
+                )
+            )
+            self._owns_websession = True
+
         try:
             async with self._websession.request(
                 method, url, params=params, json=json, auth=self._auth,
             ) as result:
                 result.raise_for_status()
-                _LOGGER.debug(f"HomeSeer request response: {await result.text()}")
-                return await result.json()
+                body = await result.read()
 
-        except ContentTypeError:
-            _LOGGER.debug(f"HomeSeer returned non-JSON response: {await result.text()}")
-
-        except TimeoutError:
+        except TimeoutError as err:
             _LOGGER.error(
                 f"Timeout while requesting HomeSeer data from {self._host}:{self._http_port}"
             )
+            if raise_errors:
+                raise HomeSeerError("Timeout") from err
+            return None
 
         except Exception as err:
             _LOGGER.error(f"HomeSeer HTTP Request error: {err}")
+            if raise_errors:
+                raise HomeSeerError(str(err)) from err
+            return None
 
-    async def _get_devices(self):
-        try:
-            params = {"request": "getstatus"}
-            result = await self._request("get", params=params)
-
-            all_devices = result["Devices"]
+        return body
 
-            params = {"request": "getcontrol"}
-            result = await self._request("get", params=params)
+    async def _timed_request(self, request):
+        """Make a GET API request and record how long it took."""
+        start = time.monotonic()
+        result = await self._request("get", params={"request": request})
+        elapsed = time.monotonic() - start
+        self.initialize_timings[request] = elapsed
+        _LOGGER.debug(f"HomeSeer {request} request took {elapsed:.3f}s")
+        return result
 
-            control_data = result["Devices"]
+    def _load_devices(self, status, control):
+        """
+        Create devices from getstatus/getcontrol payloads, returning False on error.
+        Devices that already exist with the same type are kept and updated in place
+        (name and locations included); a device whose type has changed is replaced,
+        keeping its update callback. Devices no longer present are removed.
+        """
+        try:
+            all_devices = status["Devices"]
 
-            for device in all_devices:
-                dev = get_zwave_device(device, control_data, self._request)
-                if dev is not None:
-                    self.devices[dev.ref] = dev
+            control_data = {
+                item["ref"]: item["ControlPairs"] for item in control["Devices"]
+            }
 
         except TypeError:
             _LOGGER.error("Error retrieving HomeSeer devices!")
+            return False
 
-    async def _get_events(self):
-        try:
-            params = {"request": "getevents"}
-            result = await self._request("get", params=params)
+        self.unsupported_device_types.clear()
+        devices = {}
+        for device in all_devices:
+            ref = device["ref"]
+            existing = self.devices.get(ref)
+            if (
+                existing is not None
+                and existing.device_type_string == device["device_type_string"]
+            ):
+                renamed = not existing.matches(device)
+                if renamed:
+                    existing._update_identity(device)
+                existing._get_control_values(control_data.get(ref, []))
+                old_value = existing.value
+                if existing.refresh(device["value"], device["status"]):
+                    self._notify_update(existing, old_value)
+                elif renamed:
+                    existing.update_value(None)
+                    self._notify_update(existing, old_value)
+                devices[ref] = existing
+                continue
 
-            all_events = result["Events"]
+            dev = get_device(
+                device, control_data.get(ref, []), self._device_request, self._keep_raw,
+            )
+            if dev is not None:
+                if existing is not None:
+                    dev._take_callback(existing)
+                devices[ref] = dev
+            else:
+                self.unsupported_device_types[device["device_type_string"]] += 1
+
+        if self.devices and devices.keys() != self.devices.keys():
+            added = len(devices.keys() - self.devices.keys())
+            removed = len(self.devices.keys() - devices.keys())
+            _LOGGER.info(
+                f"HomeSeer device set changed: {added} added, {removed} removed"
+            )
+        self.devices = devices
+
+        if self.unsupported_device_types:
+            _LOGGER.debug(
+                f"HomeSeer device types not supported: "
+                f"{dict(self.unsupported_device_types)}"
+            )
+        return True
 
-            for event in all_events:
-                ev = HomeSeerEvent(event, self._request)
-                self.events.append(ev)
+    def _load_events(self, result):
+        """Create events from a getevents payload, returning False on error."""
+        try:
+            all_events = result["Events"]
 
         except TypeError:
             _LOGGER.error("Error retrieving HomeSeer events!")
+            return False
+
+        self.events = [HomeSeerEvent(event, self._request) for event in all_events]
+        self._events_index = {(event.group, event.name): event for event in self.events}
+        return True
+
+    def get_event(self, group, name):
+        """Return the HomeSeerEvent with the given group and name, or None."""
+        return self._events_index.get((group, name))
+
+    async def run_events(self, events, max_concurrency=5):
+        """
+        Run events (HomeSeerEvents or (group, name) tuples) concurrently, with at
+        most max_concurrency in flight (in addition to the max_requests limit).
+        Returns a list of EventResults in the same order as events.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(group, name):
+            async with semaphore:
+                json = {"action": "runevent", "group": group, "name": name}
+                start = time.monotonic()
+                try:
+                    await self._request("post", json=json, raise_errors=True)
+                except HomeSeerError as err:
+                    latency = time.monotonic() - start
+                    return EventResult(group, name, False, latency, err)
+                latency = time.monotonic() - start
+                return EventResult(group, name, True, latency, None)
+
+        return await asyncio.gather(
+            *(
+                run(event.group, event.name)
+                if isinstance(event, HomeSeerEvent)
+                else run(*event)
+                for event in events
+            )
+        )
 
     async def _update_device_value(self, device_ref, value):
         try:
-            device = self.devices[int(device_ref)]
-            device.update_value(value)
+            device = self.devices[device_ref]
+        except KeyError:
             _LOGGER.debug(
-                f"HomeSeer device '{device.name}' ({device.ref}) updated to: {device.value}"
+                "HomeSeer update received for unsupported device: %s", device_ref
             )
+            return
 
-        except KeyError:
-            _LOGGER.debug(
-                f"HomeSeer update received for unsupported device: {device_ref}"
+        self._update_sequence += 1
+        self._last_updates[device_ref] = self._update_sequence
+
+        if device_ref in self._optimistic and self._confirm_optimistic(device, value):
+            return
+
+        window = self._coalesce_windows.get(
+            device.device_type_string, self._coalesce_window
+        )
+        if window:
+            if device_ref in self._coalesce_timers:
+                self._coalesce_pending[device_ref] = value
+                return
+            self._coalesce_timers[device_ref] = asyncio.get_event_loop().call_later(
+                window, self._flush_coalesced, device_ref, window
             )
 
+        old_value = device.value
+        device.update_value(value)
+        self._notify_update(device, old_value)
+        _LOGGER.debug(
+            "HomeSeer device '%s' (%s) updated to: %s",
+            device.name,
+            device.ref,
+            device.value,
+        )
+
+    def _flush_coalesced(self, device_ref, window):
+        """Deliver the latest value received for device_ref during its window."""
+        del self._coalesce_timers[device_ref]
+        if device_ref not in self._coalesce_pending:
+            return
+
+        device = self.devices.get(device_ref)
+        if device is None:
+            # Removed by a refresh since the window started.
+            del self._coalesce_pending[device_ref]
+            return
+        old_value = device.value
+        device.update_value(self._coalesce_pending.pop(device_ref))
+        self._notify_update(device, old_value)
+        _LOGGER.debug(
+            "HomeSeer device '%s' (%s) updated to: %s",
+            device.name,
+            device.ref,
+            device.value,
+        )
+        self._coalesce_timers[device_ref] = asyncio.get_event_loop().call_later(
+            window, self._flush_coalesced, device_ref, window
+        )
+
+    def add_update_listener(self, callback):
+        """
+        Call callback(device, old_value, reason) whenever a device value is updated,
+        in addition to the device's own update callback.
+        Returns a function that removes the listener.
+        """
+        self._update_listeners.append(callback)
+        return lambda: self._update_listeners.remove(callback)
+
+    def subscribe(self, refs=None, types=None, maxsize=100):
+        """
+        Return a Subscription: an async iterator of DeviceUpdates for devices in refs
+        and/or with a device_type_string in types (all devices if neither is given).
+        Updates are filtered before being queued, so a subscription only holds (at
+        most maxsize) updates it asked for. Close the subscription when done.
+        """
+        subscription = Subscription(self._unsubscribe, refs, types, maxsize)
+        if subscription.refs is not None:
+            for ref in subscription.refs:
+                self._ref_subscriptions[ref].add(subscription)
+        elif subscription.types is not None:
+            for device_type in subscription.types:
+                self._type_subscriptions[device_type].add(subscription)
+        else:
+            self._all_subscriptions.add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        if subscription.refs is not None:
+            index, keys = self._ref_subscriptions, subscription.refs
+        elif subscription.types is not None:
+            index, keys = self._type_subscriptions, subscription.types
+        else:
+            self._all_subscriptions.discard(subscription)
+            return
+        for key in keys:
+            index[key].discard(subscription)
+            if not index[key]:
+                del index[key]
+
+    def _notify_update(self, device, old_value, reason=None):
+        for callback in self._update_listeners:
+            try:
+                callback(device, old_value, reason)
+            except Exception as err:
+                _LOGGER.error(f"HomeSeer update listener error: {err}")
+
+        device_type = device.device_type_string
+        subscriptions = [
+            subscription
+            for subscription in self._ref_subscriptions.get(device.ref, ())
+            if subscription.types is None or device_type in subscription.types
+        ]
+        subscriptions.extend(self._type_subscriptions.get(device_type, ()))
+        subscriptions.extend(self._all_subscriptions)
+        if not subscriptions:
+            return
+
+        update = DeviceUpdate(device.ref, old_value, device.value, reason, time.time())
+        for subscription in subscriptions:
+            subscription.put(update)
+
+    def _cancel_coalesced(self):
+        for timer in self._coalesce_timers.values():
+            timer.cancel()
+        self._coalesce_timers.clear()
+        self._coalesce_pending.clear()
+
     async def _disconnect_callback(self):
+        # Pending coalesced values are superseded by the refresh on reconnect.
+        self._cancel_coalesced()
+
         for device in self.devices.values():
             device.update_value(None, REASON_DISCONNECTED)
+        self._disconnect_notified = True
+
+    async def refresh_devices(
+        self, reason=None, refs=None, location=None, location2=None, device_type=None
+    ):
+        """
+        Refresh devices from getstatus, firing update callbacks only for devices
+        whose value or status has changed (and, on reconnect, for every device
+        whose callback was told of the disconnect).
+        Returns a dict of {ref: (old_value, new_value)} for the changed devices.
+
+        The refresh can be limited to refs, location (HomeSeer's location1),
+        location2 and/or device_type (matched against the devices already known).
+        Concurrent refreshes limited only by ref/device_type are batched into one
+        getstatus request.
+        """
+        if refs is not None:
+            refs = set(refs)
+            if not refs:
+                return {}
+
+        if device_type is not None:
+            type_refs = {
+                ref
+                for ref, device in self.devices.items()
+                if device.device_type_string == device_type
+            }
+            refs = type_refs if refs is None else type_refs & refs
+            if not refs:
+                return {}
+
+        if refs is not None and location is None and location2 is None:
+            return await self._refresh_batched(refs, reason)
+
+        params = {"request": "getstatus"}
+        if refs is not None:
+            params["ref"] = ",".join(str(ref) for ref in sorted(refs))
+        if location is not None:
+            params["location1"] = location
+        if location2 is not None:
+            params["location2"] = location2
+        return await self._refresh(params, reason)
+
+    async def _refresh_batched(self, refs, reason):
+        batch = self._refresh_batches.get(reason)
+        if batch is None:
+            batch = (set(), asyncio.get_event_loop().create_future())
+            self._refresh_batches[reason] = batch
+            task = asyncio.get_event_loop().create_task(self._run_refresh_batch(reason))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+        batch[0].update(refs)
+
+        changed = await asyncio.shield(batch[1])
+        if changed is None:
+            return None
+        return {ref: values for ref, values in changed.items() if ref in refs}
+
+    async def _run_refresh_batch(self, reason):
+        # Let other refreshes requested in this iteration of the loop join the batch.
+        await asyncio.sleep(0)
+        refs, future = self._refresh_batches.pop(reason)
+        params = {
+            "request": "getstatus",
+            "ref": ",".join(str(ref) for ref in sorted(refs)),
+        }
+        try:
+            future.set_result(await self._refresh(params, reason))
+        except Exception as err:
+            future.set_exception(err)
 
-    async def refresh_devices(self, reason=None):
+    async def _refresh(self, params, reason):
+        # Devices updated over DC after this point are newer than the response.
+        sequence = self._update_sequence
         try:
-            params = {"request": "getstatus"}
             result = await self._request("get", params=params)
 
             all_devices = result["Devices"]
@@ -162,15 +863,49 @@ class HomeTroller:
             _LOGGER.error("Error retrieving HomeSeer data for refresh!")
             return
 
+        # Devices told of a disconnect hear about the reconnect even if unchanged.
+        reconnected = reason == REASON_RECONNECTED and self._disconnect_notified
+        changed = {}
         for device in all_devices:
             try:
                 dev = self.devices[device["ref"]]
-                dev.update_value(device["value"], reason)
+            except KeyError:
                 _LOGGER.debug(
-                    f"HomeSeer device '{dev.name}' ({dev.ref}) refreshed to: {dev.value}"
+                    "HomeSeer refresh data retrieved for unsupported device type: "
+                    "%s (%s)",
+                    device["device_type_string"],
+                    device["ref"],
                 )
-            except KeyError:
+                continue
+
+            if self._last_updates.get(dev.ref, 0) > sequence:
+                continue
+
+            if dev.ref in self._optimistic:
+                # Only a matching value resolves it. Otherwise getstatus may predate
+                # the command, so leave the optimistic value for the DC or timeout.
+                self._confirm_optimistic(dev, device["value"], resolve_mismatch=False)
+                if dev.ref in self._optimistic:
+                    if reconnected:
+                        dev.update_value(None, reason)
+                    continue
+
+            old_value = dev.value
+            if dev.refresh(device["value"], device["status"], reason):
+                changed[dev.ref] = (old_value, dev.value)
+                self._notify_update(dev, old_value, reason)
                 _LOGGER.debug(
-                    f"HomeSeer refresh data retrieved for unsupported device type: "
-                    f"{device['device_type_string']} ({device['ref']})"
+                    "HomeSeer device '%s' (%s) refreshed to: %s",
+                    dev.name,
+                    dev.ref,
+                    dev.value,
                 )
+            elif reconnected:
+                dev.update_value(None, reason)
+
+        if reconnected:
+            self._disconnect_notified = False
+        _LOGGER.debug(
+            "HomeSeer refresh: %s of %s devices changed", len(changed), len(all_devices)
+        )
+        return changed
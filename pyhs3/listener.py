@@ -1,17 +1,35 @@
 """ASCII/Telnet listener for HomeSeer."""
 
 import asyncio
+import random
+import time
 
 from .const import (
     _LOGGER,
+    OVERFLOW_BACKPRESSURE,
     REASON_RECONNECTED,
     STATE_IDLE,
     STATE_LISTENING,
     STATE_STOPPED,
 )
+from .dispatch import UpdateQueue
 from .errors import HomeSeerASCIIConnectionError
 
 
+def parse_device_change(msg):
+    """
+    Parse a raw "DC,ref,new value,old value" line without decoding the whole line.
+    Returns (int ref, str value), or None if msg is not a well-formed DC message.
+    """
+    if not msg.startswith(b"DC,"):
+        return None
+    fields = msg.split(b",", 3)
+    try:
+        return int(fields[1]), fields[2].decode()
+    except (IndexError, ValueError):
+        return None
+
+
 class ASCIIListener:
     def __init__(self, host, **kwargs):
         self._host = host
@@ -23,9 +41,33 @@ class ASCIIListener:
         self._password = kwargs.get("password")
         self._reader = None
         self._writer = None
+        self._connected = False
         self._reconnect_flag = False
         self._state = STATE_IDLE
         self._flag = True
+        self._queue = UpdateQueue(
+            kwargs.get("queue_size", 1000),
+            kwargs.get("queue_overflow", OVERFLOW_BACKPRESSURE),
+        )
+        self._dispatcher = None
+        self._metrics = kwargs.get("metrics")
+        self._capture = kwargs.get("capture")
+        self._supervisor = None
+        self._pinger_task = None
+        self._closed = asyncio.Event()
+        self._closed.set()
+        self._reconnect_delay_base = kwargs.get("reconnect_delay", 1)
+        self._reconnect_max_delay = kwargs.get("reconnect_max_delay", 60)
+        self._reconnect_attempts = 0
+        self._reconnects = 0
+        self._disconnected_at = None
+        self._last_reconnect_time = None
+        self._ping_interval = kwargs.get("ping_interval", 30)
+        self._ping_timeout = kwargs.get("ping_timeout", 10)
+        self._ping_sent_at = None
+        self._ping_answered = False
+        self._ping_rtt = None
+        self._ping_timeouts = 0
 
     @property
     def state(self):
@@ -35,10 +77,56 @@ class ASCIIListener:
     def state(self, value):
         self._state = value
 
+    @property
+    def closed(self):
+        """True when no listener tasks are running (before start or after stop)."""
+        return self._closed.is_set()
+
+    async def wait_closed(self):
+        """Wait until the listener has stopped and all of its tasks have finished."""
+        await self._closed.wait()
+
+    @property
+    def queue_metrics(self):
+        """Return update queue depth and dropped/coalesced message counts."""
+        return self._queue.as_dict()
+
+    @property
+    def reconnect_metrics(self):
+        """
+        Return the number of attempts made by the current (or most recent)
+        reconnection, the number of successful reconnections and how long (in seconds)
+        the last reconnection took.
+        """
+        return {
+            "attempts": self._reconnect_attempts,
+            "reconnects": self._reconnects,
+            "last_reconnect_time": self._last_reconnect_time,
+        }
+
+    @property
+    def ping_metrics(self):
+        """
+        Return the last ping round trip time (in seconds) and the number of
+        connections closed because a ping went unanswered.
+        """
+        return {"ping_rtt": self._ping_rtt, "ping_timeouts": self._ping_timeouts}
+
     async def _start_listener(self):
+        """
+        Connect and listen until the connection drops.
+        Returns True if the connection was healthy: logged in, and either a ping
+        was answered or it stayed up for at least ping_interval seconds.
+        """
+        logged_in = False
+        connected_at = None
         connection = asyncio.open_connection(self._host, self._port)
         try:
             self._reader, self._writer = await asyncio.wait_for(connection, timeout=3)
+            self._connected = True
+            if self._state == STATE_STOPPED:
+                self._writer.close()
+                return False
             _LOGGER.info(
                 f"HomeSeer ASCII Listener connected to {self._host}:{self._port}"
             )
@@ -46,33 +134,56 @@ class ASCIIListener:
 
             if not await self._login():
                 raise Exception("Error logging in to ASCII listener")
+            logged_in = True
+            connected_at = time.monotonic()
+            self._ping_sent_at = None
+            self._ping_answered = False
+
+            if self._disconnected_at is not None:
+                self._reconnects += 1
+                self._last_reconnect_time = time.monotonic() - self._disconnected_at
+                self._disconnected_at = None
+                if self._metrics is not None:
+                    self._metrics.reconnected(
+                        self._reconnect_attempts, self._last_reconnect_time
+                    )
 
             self._flag = True
-            asyncio.get_event_loop().create_task(self._pinger())
+            self._pinger_task = asyncio.get_event_loop().create_task(self._pinger())
+
+            if self._dispatcher is None or self._dispatcher.done():
+                self._dispatcher = asyncio.get_event_loop().create_task(
+                    self._dispatch_messages()
+                )
 
             if self._reconnect_flag and self._async_reconnection_callback is not None:
+                # Let an update already being dispatched finish before the refresh.
+                await self._queue.join()
                 await self._async_reconnection_callback(reason=REASON_RECONNECTED)
             self._reconnect_flag = False
 
-            while True:
-                msg = await self._reader.readline()
-                _LOGGER.debug(f"HomeSeer raw ASCII message received: {msg}")
-                if msg == b"":
-                    raise HomeSeerASCIIConnectionError
-                else:
-                    await self._handle_message(msg.decode())
+            await self._read_messages()
 
         except HomeSeerASCIIConnectionError:
             _LOGGER.error("Empty ASCII message received, connection error")
-            await self._handle_disconnect()
 
         except asyncio.TimeoutError:
             _LOGGER.error("HomeSeer ASCII listener connect timed out")
-            await self._handle_disconnect()
 
         except Exception as err:
             _LOGGER.error(f"HomeSeer ASCII listener error: {err}")
-            await self._handle_disconnect()
+
+        finally:
+            # Each connection owns exactly one pinger, which ends with it.
+            if self._pinger_task is not None:
+                self._pinger_task.cancel()
+                await _wait_cancelled(self._pinger_task)
+                self._pinger_task = None
+
+        return logged_in and (
+            self._ping_answered
+            or time.monotonic() - connected_at >= self._ping_interval
+        )
 
     async def _login(self):
         if self._writer is None:
@@ -88,60 +199,186 @@ class ASCIIListener:
             msg = await asyncio.wait_for(self._reader.readline(), timeout=3)
             if msg.decode().strip() == "ok":
                 _LOGGER.debug("HomeSeer ASCII login ok")
-            else:
-                _LOGGER.debug("HomeSeer ASCII login error: bad user or pass")
-            return True
+                return True
+            _LOGGER.error("HomeSeer ASCII login error: bad user or pass")
+            return False
         except asyncio.TimeoutError:
             _LOGGER.error("HomeSeer ASCII login timeout")
             return False
 
+    async def _read_messages(self):
+        metrics = self._metrics
+        while True:
+            msg = await self._reader.readline()
+            _LOGGER.debug("HomeSeer raw ASCII message received: %s", msg)
+            if self._capture is not None and msg:
+                self._capture.write_ascii(msg)
+            if msg == b"":
+                raise HomeSeerASCIIConnectionError
+            if metrics is None:
+                frame = parse_device_change(msg)
+            else:
+                start = time.perf_counter()
+                frame = parse_device_change(msg)
+                metrics.message_received(time.perf_counter() - start)
+            if frame is None:
+                await self._handle_message(msg.decode())
+            else:
+                self._flag = True
+                await self._queue.put(*frame)
+
+    async def _dispatch_messages(self):
+        metrics = self._metrics
+        while True:
+            ref, value = await self._queue.get()
+            if self._async_message_callback is None:
+                self._queue.task_done()
+                continue
+            if metrics is not None:
+                metrics.update_queue_depth(len(self._queue))
+                start = time.perf_counter()
+            try:
+                await self._async_message_callback(ref, value)
+            except Exception as err:
+                _LOGGER.error(f"HomeSeer ASCII message callback error: {err}")
+            self._queue.task_done()
+            if metrics is not None:
+                metrics.callback_completed(ref, time.perf_counter() - start)
+
+    async def replay(self, reader):
+        """
+        Run the read loop and dispatcher on reader (e.g. a replayed capture) until
+        it reaches EOF and every update has been dispatched.
+        """
+        self._reader = reader
+        dispatcher = asyncio.get_event_loop().create_task(self._dispatch_messages())
+        try:
+            await self._read_messages()
+        except HomeSeerASCIIConnectionError:
+            pass
+        await self._queue.join()
+        dispatcher.cancel()
+        await _wait_cancelled(dispatcher)
+
     async def _handle_message(self, raw):
         msg = raw.split(",")
         self._flag = True
-        if msg[0] == "DC" and self._async_message_callback is not None:
-            await self._async_message_callback(msg[1], msg[2])
-        else:
-            _LOGGER.debug(
-                f"HomeSeer unhandled ASCII message type received: {msg[0].strip()}"
-            )
+        if self._ping_sent_at is not None:
+            # The first non-DC message after a ping is taken to be its reply.
+            self._ping_rtt = time.monotonic() - self._ping_sent_at
+            self._ping_sent_at = None
+            self._ping_answered = True
+            _LOGGER.debug("HomeSeer ASCII ping round trip: %.3fs", self._ping_rtt)
+        _LOGGER.debug(
+            "HomeSeer unhandled ASCII message type received: %s", msg[0].strip()
+        )
 
     async def _handle_disconnect(self):
+        self._connected = False
         self._reconnect_flag = True
+        if self._disconnected_at is None and self.state != STATE_STOPPED:
+            self._disconnected_at = time.monotonic()
         if self._writer is not None:
             self._writer.close()
+        # Queued updates are superseded by the refresh on reconnect.
+        self._queue.clear()
 
         if self._async_disconnection_callback is not None:
             await self._async_disconnection_callback()
 
-        await self.connection_handler()
-
     async def _pinger(self):
+        """
+        Send vr every ping_interval seconds and close the connection if nothing
+        is received within ping_timeout seconds of a ping.
+        Cancelled by _start_listener when the connection ends.
+        """
+        writer = self._writer
         while True:
-            if self.state == STATE_LISTENING:
-                if self._flag:
-                    self._flag = False
-                    _LOGGER.debug("Sending ping...")
-                    self._writer.write("vr\r\n".encode())
-                    await self._writer.drain()
-                    await asyncio.sleep(120)
-                else:
-                    _LOGGER.debug("Ping timeout, closing ASCII connection")
-                    self._writer.close()
-                    break
-            else:
+            self._flag = False
+            self._ping_sent_at = time.monotonic()
+            _LOGGER.debug("Sending ping...")
+            writer.write("vr\r\n".encode())
+            await writer.drain()
+
+            await asyncio.sleep(self._ping_timeout)
+            if not self._flag:
+                _LOGGER.debug("Ping timeout, closing ASCII connection")
+                self._ping_timeouts += 1
+                writer.close()
                 break
 
+            await asyncio.sleep(max(0, self._ping_interval - self._ping_timeout))
+
+    def _reconnect_delay(self, attempt):
+        """
+        No delay before the first reconnection attempt, then exponential backoff
+        (capped at reconnect_max_delay) with up to 50% jitter.
+        """
+        if attempt <= 1:
+            return 0
+        delay = min(
+            self._reconnect_max_delay, self._reconnect_delay_base * 2 ** (attempt - 2)
+        )
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def _supervise(self):
+        attempt = 0
+        while self.state != STATE_STOPPED:
+            delay = self._reconnect_delay(attempt)
+            if delay:
+                _LOGGER.info(f"Reconnecting ASCII Listener in {delay:.1f} seconds...")
+                await asyncio.sleep(delay)
+                if self.state == STATE_STOPPED:
+                    break
+
+            _LOGGER.debug(f"Connecting ASCII listener to {self._host}:{self._port}")
+            self._state = STATE_IDLE
+            self._reconnect_attempts = attempt
+            # Only a healthy connection resets the backoff, so a server that
+            # accepts and then drops connections is not hammered.
+            if await self._start_listener():
+                attempt = 0
+            attempt += 1
+            await self._handle_disconnect()
+
     async def connection_handler(self):
+        """
+        Start the supervisor task, which owns the connection and its pinger,
+        or if the state is STATE_STOPPED cancel every listener task, wait for
+        them to finish and handle the disconnect of an open connection.
+        """
         if self.state == STATE_STOPPED:
             _LOGGER.debug("Stopping and closing ASCII listener")
             self._reconnect_flag = True
             if self._writer is not None:
                 self._writer.close()
-        else:
-            if self._reconnect_flag:
-                time = 10
-                _LOGGER.info(f"Reconnecting ASCII Listener in {time} seconds...")
-                await asyncio.sleep(time)
-            _LOGGER.debug(f"Connecting ASCII listener to {self._host}:{self._port}")
-            self._state = STATE_IDLE
-            asyncio.get_event_loop().create_task(self._start_listener())
+            tasks = [
+                task
+                for task in (self._supervisor, self._pinger_task, self._dispatcher)
+                if task is not None and task is not asyncio.current_task()
+            ]
+            self._supervisor = None
+            self._pinger_task = None
+            self._dispatcher = None
+            for task in tasks:
+                task.cancel()
+            for task in tasks:
+                await _wait_cancelled(task)
+            if self._connected:
+                await self._handle_disconnect()
+            self._closed.set()
+        elif self._supervisor is None or self._supervisor.done():
+            self._closed.clear()
+            self._supervisor = asyncio.get_event_loop().create_task(self._supervise())
+
+
+async def _wait_cancelled(task):
+    """Wait for a cancelled task to finish, without propagating its cancellation."""
+    try:
+        await task
+    except asyncio.CancelledError:
+        # Still running means the caller itself was cancelled.
+        if not task.done():
+            raise
+    except Exception:
+        pass
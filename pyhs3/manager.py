@@ -0,0 +1,136 @@
+"""Manages connections to many HomeTrollers from one process."""
+
+import asyncio
+import time
+
+from aiohttp import ClientSession, TCPConnector
+
+from .const import _LOGGER, STATE_STOPPED
+from .hometroller import HomeTroller
+from .listener import _wait_cancelled
+
+
+class HomeTrollerManager:
+    """
+    Runs many HomeTrollers over one shared HTTP session.
+    start() initializes controllers stagger seconds apart, and device updates from
+    all of them are merged into one stream of (controller name, ref, value), see
+    updates(). If the stream is not consumed, the oldest updates beyond queue_size
+    are dropped.
+    """
+
+    def __init__(self, stagger=1, max_connections=100, queue_size=10000):
+        self._stagger = stagger
+        self._max_connections = max_connections
+        self._session = None
+        self._queue = asyncio.Queue(queue_size)
+        self._controllers = {}
+        self._stats = {}
+        self._tasks = {}
+        self.dropped = 0
+
+    @property
+    def controllers(self):
+        return dict(self._controllers)
+
+    def add_controller(self, name, host, **kwargs):
+        """
+        Create a HomeTroller using the shared session; kwargs are passed to it.
+        The controller is started by the next call to start().
+        """
+        if name in self._controllers:
+            raise ValueError(f"HomeTroller {name} already added")
+
+        if self._session is None:
+            self._session = ClientSession(
+                connector=TCPConnector(limit=self._max_connections)
+            )
+
+        homeseer = HomeTroller(host, self._session, **kwargs)
+        homeseer.add_update_listener(
+            lambda device, old_value, reason: self._enqueue(name, device)
+        )
+        self._controllers[name] = homeseer
+        self._stats[name] = {
+            "started": None,
+            "initialize_time": None,
+            "updates": 0,
+            "error": None,
+        }
+        return homeseer
+
+    async def start(self):
+        """Initialize and start listening on every controller not already started."""
+        names = [name for name in self._controllers if name not in self._tasks]
+        for i, name in enumerate(names):
+            self._tasks[name] = asyncio.get_event_loop().create_task(
+                self._start_controller(name, i * self._stagger)
+            )
+        await asyncio.gather(*(self._tasks[name] for name in names))
+
+    async def stop(self):
+        """Stop every controller and close the shared session."""
+        for name in list(self._controllers):
+            await self.remove_controller(name)
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def remove_controller(self, name):
+        homeseer = self._controllers.pop(name)
+        self._stats.pop(name)
+        task = self._tasks.pop(name, None)
+        if task is not None and not task.done():
+            task.cancel()
+            await _wait_cancelled(task)
+        if homeseer.state != STATE_STOPPED:
+            await homeseer.stop_listener()
+        await homeseer.close()
+
+    async def updates(self):
+        """Async iterator of (controller name, ref, value) for all controllers."""
+        while True:
+            yield await self._queue.get()
+
+    def stats(self):
+        """Return health and throughput statistics for each controller."""
+        now = time.monotonic()
+        stats = {}
+        for name, homeseer in self._controllers.items():
+            site = self._stats[name]
+            elapsed = now - site["started"] if site["started"] is not None else None
+            stats[name] = {
+                "state": homeseer.state,
+                "devices": len(homeseer.devices),
+                "initialize_time": site["initialize_time"],
+                "error": site["error"],
+                "updates": site["updates"],
+                "updates_per_second": site["updates"] / elapsed if elapsed else 0,
+                "requests": homeseer.request_metrics,
+                "commands": homeseer.command_metrics,
+                "update_queue": homeseer.update_queue_metrics,
+                "reconnects": homeseer.reconnect_metrics,
+                "ping": homeseer.ping_metrics,
+            }
+        return stats
+
+    async def _start_controller(self, name, delay):
+        await asyncio.sleep(delay)
+        homeseer = self._controllers[name]
+        site = self._stats[name]
+        start = time.monotonic()
+        try:
+            await homeseer.initialize()
+            site["initialize_time"] = time.monotonic() - start
+            await homeseer.start_listener()
+        except Exception as err:
+            _LOGGER.error(f"Error starting HomeTroller {name}: {err}")
+            site["error"] = str(err)
+        site["started"] = time.monotonic()
+
+    def _enqueue(self, name, device):
+        self._stats[name]["updates"] += 1
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait((name, device.ref, device.value))
@@ -0,0 +1,107 @@
+"""Request and command metrics for the HomeSeer JSON API."""
+
+from collections import Counter, defaultdict, deque
+
+
+def _percentiles(samples, percentiles):
+    samples = sorted(samples)
+    if not samples:
+        return {}
+    return {
+        p: samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+        for p in percentiles
+    }
+
+
+class RequestMetrics:
+    """Tracks queue depth, in-flight requests and recent latencies per request type."""
+
+    def __init__(self, samples=1000):
+        self.queued = 0
+        self.in_flight = 0
+        self._latencies = defaultdict(lambda: deque(maxlen=samples))
+
+    def record(self, request_type, latency):
+        self._latencies[request_type].append(latency)
+
+    def percentiles(self, request_type, percentiles=(50, 90, 99)):
+        """Return {percentile: latency in seconds} over the most recent samples."""
+        return _percentiles(self._latencies.get(request_type, ()), percentiles)
+
+    def as_dict(self):
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "latency": {
+                request_type: self.percentiles(request_type)
+                for request_type in self._latencies
+            },
+        }
+
+
+class CommandMetrics:
+    """
+    Tracks optimistic commands per device type: how many were confirmed, recent
+    command-to-confirmation latencies, how many were answered by a DC update with
+    a different value (mismatched), and how many timed out.
+    """
+
+    def __init__(self, samples=1000):
+        self.confirmed = Counter()
+        self.mismatched = Counter()
+        self.timed_out = Counter()
+        self._latencies = defaultdict(lambda: deque(maxlen=samples))
+
+    def record(self, device_type, latency):
+        self.confirmed[device_type] += 1
+        self._latencies[device_type].append(latency)
+
+    def as_dict(self):
+        return {
+            device_type: {
+                "confirmed": self.confirmed[device_type],
+                "mismatched": self.mismatched[device_type],
+                "timed_out": self.timed_out[device_type],
+                "latency": _percentiles(
+                    self._latencies.get(device_type, ()), (50, 90, 99)
+                ),
+            }
+            for device_type in (
+                self.confirmed.keys() | self.mismatched.keys() | self.timed_out.keys()
+            )
+        }
+
+
+class MetricsHook:
+    """
+    Interface for collecting pyhs3 metrics; pass an instance to HomeTroller(metrics=).
+    Every method is a no-op, so subclasses only override what they need.
+    When no hook is given, pyhs3 skips the timing calls entirely.
+    """
+
+    def request_completed(self, request_type, latency):
+        """A JSON API request of request_type completed in latency seconds."""
+
+    def request_queue_depth(self, depth):
+        """depth JSON API requests are waiting for a free slot."""
+
+    def message_received(self, parse_time):
+        """An ASCII message was received and parsed in parse_time seconds."""
+
+    def callback_completed(self, ref, duration):
+        """The message callback for a DC update to ref took duration seconds."""
+
+    def update_queue_depth(self, depth):
+        """depth DC updates are waiting in the listener's update queue."""
+
+    def reconnected(self, attempts, duration):
+        """The ASCII listener reconnected after attempts tries and duration seconds."""
+
+    def command_confirmed(self, device_type, latency):
+        """An optimistic command was confirmed after latency seconds."""
+
+    def command_mismatched(self, device_type):
+        """An optimistic command was answered by a DC update with another value."""
+
+    def command_timed_out(self, device_type):
+        """An optimistic command was not confirmed in time and was rolled back."""
@@ -0,0 +1,241 @@
+"""
+Local stand-in for a HomeTroller, for benchmarking and load testing pyhs3
+without real hardware. Serves the JSON API over HTTP and speaks the ASCII
+protocol (au, vr and DC messages) on a second port.
+"""
+
+import asyncio
+import random
+
+from aiohttp import web
+
+from .const import (
+    _LOGGER,
+    DEVICE_ZWAVE_BATTERY,
+    DEVICE_ZWAVE_DOOR_LOCK,
+    DEVICE_ZWAVE_SENSOR_BINARY,
+    DEVICE_ZWAVE_SWITCH_BINARY,
+    DEVICE_ZWAVE_SWITCH_MULTILEVEL,
+    DEVICE_ZWAVE_TEMPERATURE,
+)
+from .device import _parse_value
+
+DEVICE_TYPES = [
+    DEVICE_ZWAVE_SWITCH_MULTILEVEL,
+    DEVICE_ZWAVE_SWITCH_BINARY,
+    DEVICE_ZWAVE_SENSOR_BINARY,
+    DEVICE_ZWAVE_TEMPERATURE,
+    DEVICE_ZWAVE_DOOR_LOCK,
+    DEVICE_ZWAVE_BATTERY,
+    "Unsupported Device",
+]
+
+
+def getstatus(count):
+    """Return a synthetic getstatus payload for devices with refs 1 to count."""
+    return {
+        "Devices": [
+            {
+                "ref": ref,
+                "name": f"Device {ref}",
+                "location": f"Room {ref % 20}",
+                "location2": f"Floor {ref % 3}",
+                "value": ref % 100,
+                "status": f"{ref % 100}%",
+                "device_type_string": DEVICE_TYPES[ref % len(DEVICE_TYPES)],
+            }
+            for ref in range(1, count + 1)
+        ]
+    }
+
+
+def getcontrol(count):
+    """Return a synthetic getcontrol payload for devices with refs 1 to count."""
+    return {
+        "Devices": [
+            {
+                "ref": ref,
+                "ControlPairs": [
+                    {"ControlUse": 1, "Label": "On", "ControlValue": 99},
+                    {"ControlUse": 2, "Label": "Off", "ControlValue": 0},
+                ],
+            }
+            for ref in range(1, count + 1)
+        ]
+    }
+
+
+def getevents(count):
+    """Return a synthetic getevents payload with count events."""
+    return {
+        "Events": [
+            {"Group": f"Group {i % 10}", "Name": f"Event {i}"} for i in range(count)
+        ]
+    }
+
+
+class HomeSeerSimulator:
+    """
+    latency is added (in seconds) to every JSON response; update_rate is the number
+    of random DC messages per second sent to ASCII clients (0 to disable).
+    The DC message for a controldevicebyvalue command is sent confirm_delay seconds
+    after the command, or never if confirm_delay is None (the value still changes,
+    as if the DC message were lost).
+    Ports of 0 pick free ports; the bound ports are available after start().
+    """
+
+    def __init__(
+        self,
+        devices=100,
+        events=10,
+        latency=0,
+        update_rate=0,
+        host="127.0.0.1",
+        http_port=0,
+        ascii_port=0,
+        confirm_delay=0,
+    ):
+        self._status = getstatus(devices)
+        self._control = getcontrol(devices)
+        self._events = getevents(events)
+        self._devices = {device["ref"]: device for device in self._status["Devices"]}
+        self._latency = latency
+        self._update_rate = update_rate
+        self._confirm_delay = confirm_delay
+        self._host = host
+        self._runner = None
+        self._ascii_server = None
+        self._clients = set()
+        self._updater = None
+        self.http_port = http_port
+        self.ascii_port = ascii_port
+        self.commands = []
+        self.events_run = []
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route("*", "/JSON", self._handle_json)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self.http_port)
+        await site.start()
+        self.http_port = self._runner.addresses[0][1]
+
+        self._ascii_server = await asyncio.start_server(
+            self._handle_ascii, self._host, self.ascii_port
+        )
+        self.ascii_port = self._ascii_server.sockets[0].getsockname()[1]
+
+        if self._update_rate:
+            self._updater = asyncio.get_event_loop().create_task(self._send_updates())
+
+        _LOGGER.info(
+            f"HomeSeer simulator listening on {self._host} "
+            f"(HTTP {self.http_port}, ASCII {self.ascii_port})"
+        )
+
+    async def stop(self):
+        if self._updater is not None:
+            self._updater.cancel()
+        for writer in list(self._clients):
+            writer.close()
+        self._ascii_server.close()
+        await self._ascii_server.wait_closed()
+        await self._runner.cleanup()
+
+    def set_value(self, ref, value, notify=True):
+        """Change a device value and send the DC message to all ASCII clients."""
+        device = self._devices[ref]
+        old_value = device["value"]
+        device["value"] = value
+        device["status"] = f"{value}%"
+        if notify:
+            self.broadcast(f"DC,{ref},{value},{old_value}\r\n".encode())
+
+    def drop_clients(self):
+        """Close every ASCII client connection, as a HomeTroller restart would."""
+        for writer in list(self._clients):
+            writer.close()
+
+    def broadcast(self, msg):
+        for writer in self._clients:
+            writer.write(msg)
+
+    async def _handle_json(self, request):
+        if request.method == "POST":
+            body = await request.json()
+            action = body.get("action")
+        else:
+            body = request.query
+            action = body.get("request")
+
+        # The response reflects the state when the request arrived, as if the
+        # latency were all on the way back.
+        response = self._respond(action, body)
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return response
+
+    def _respond(self, action, body):
+        if action == "getstatus":
+            return web.json_response(self._getstatus(body))
+        if action == "getcontrol":
+            return web.json_response(self._control)
+        if action == "getevents":
+            return web.json_response(self._events)
+        if action == "controldevicebyvalue":
+            ref = int(body["ref"])
+            value = _parse_value(body["value"])
+            self.commands.append((ref, value))
+            if self._confirm_delay == 0:
+                self.set_value(ref, value)
+            elif self._confirm_delay is None:
+                self.set_value(ref, value, notify=False)
+            else:
+                asyncio.get_event_loop().call_later(
+                    self._confirm_delay, self.set_value, ref, value
+                )
+            return web.json_response({"Devices": [self._devices[ref]]})
+        if action == "runevent":
+            self.events_run.append((body.get("group"), body.get("name")))
+            return web.json_response({"Response": "ok"})
+        return web.json_response({"Response": "error"})
+
+    def _getstatus(self, query):
+        devices = self._status["Devices"]
+        if "ref" in query:
+            refs = {int(ref) for ref in str(query["ref"]).split(",")}
+            devices = [device for device in devices if device["ref"] in refs]
+        if "location1" in query:
+            devices = [d for d in devices if d["location"] == query["location1"]]
+        if "location2" in query:
+            devices = [d for d in devices if d["location2"] == query["location2"]]
+        if devices is self._status["Devices"]:
+            return self._status
+        return {"Devices": devices}
+
+    async def _handle_ascii(self, reader, writer):
+        self._clients.add(writer)
+        try:
+            while True:
+                msg = await reader.readline()
+                if msg == b"":
+                    break
+                command = msg.decode().strip().split(",")
+                if command[0] == "au":
+                    writer.write(b"ok\r\n")
+                elif command[0] == "vr":
+                    writer.write(b"3.0.0.548\r\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    async def _send_updates(self):
+        refs = list(self._devices)
+        while True:
+            ref = random.choice(refs)
+            self.set_value(ref, random.randint(0, 99))
+            await asyncio.sleep(1 / self._update_rate)
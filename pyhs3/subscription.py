@@ -0,0 +1,55 @@
+"""Streaming subscriptions to HomeSeer device updates."""
+
+import asyncio
+from collections import deque, namedtuple
+
+DeviceUpdate = namedtuple(
+    "DeviceUpdate", ["ref", "old_value", "new_value", "reason", "timestamp"]
+)
+
+
+class Subscription:
+    """
+    Async iterator of DeviceUpdates, created by HomeTroller.subscribe().
+    Holds at most maxsize updates; older updates are dropped (and counted) if the
+    subscriber falls behind. Call close(), or use as an async context manager,
+    to unsubscribe.
+    """
+
+    def __init__(self, unsubscribe, refs=None, types=None, maxsize=100):
+        self._unsubscribe = unsubscribe
+        self._updates = deque(maxlen=maxsize)
+        self._event = asyncio.Event()
+        self._closed = False
+        self.refs = frozenset(refs) if refs is not None else None
+        self.types = frozenset(types) if types is not None else None
+        self.dropped = 0
+
+    def put(self, update):
+        if len(self._updates) == self._updates.maxlen:
+            self.dropped += 1
+        self._updates.append(update)
+        self._event.set()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._unsubscribe(self)
+            self._event.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._updates:
+            if self._closed:
+                raise StopAsyncIteration
+            self._event.clear()
+            await self._event.wait()
+        return self._updates.popleft()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
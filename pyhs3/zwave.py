@@ -1,7 +1,6 @@
 """Models Z-Wave devices."""
 
 from .const import (
-    _LOGGER,
     DEVICE_ZWAVE_BARRIER_OPERATOR,
     DEVICE_ZWAVE_BATTERY,
     DEVICE_ZWAVE_CENTRAL_SCENE,
@@ -21,17 +20,20 @@ from .const import (
     STATE_OPEN,
     STATE_OPENING,
 )
-from .device import HomeSeerDevice
+from .device import HomeSeerDevice, get_device, register_device_class
 
 
 class ZWaveBarrierOperator(HomeSeerDevice):
+    __slots__ = ()
+
     @property
     def current_state(self):
-        if self.value == 0:
+        value = self._value
+        if value == 0:
             return STATE_CLOSED
-        elif self.value == 252:
+        elif value == 252:
             return STATE_CLOSING
-        elif self.value == 254:
+        elif value == 254:
             return STATE_OPENING
         else:
             return STATE_OPEN
@@ -57,18 +59,20 @@ class ZWaveBarrierOperator(HomeSeerDevice):
 
 class ZWaveBattery(HomeSeerDevice):
 
-    pass
+    __slots__ = ()
 
 
 class ZWaveCentralScene(HomeSeerDevice):
 
-    pass
+    __slots__ = ()
 
 
 class ZwaveDoorLock(HomeSeerDevice):
+    __slots__ = ()
+
     @property
     def is_locked(self):
-        return self.value == self._lock_value
+        return self._value == self._lock_value
 
     async def lock(self):
         params = {
@@ -91,38 +95,40 @@ class ZwaveDoorLock(HomeSeerDevice):
 
 class ZWaveFanState(HomeSeerDevice):
 
-    pass
+    __slots__ = ()
 
 
 class ZWaveLuminance(HomeSeerDevice):
 
-    pass
+    __slots__ = ()
 
 
 class ZWaveOperatingState(HomeSeerDevice):
 
-    pass
+    __slots__ = ()
 
 
 class ZWaveRelativeHumidity(HomeSeerDevice):
 
-    pass
+    __slots__ = ()
 
 
 class ZWaveSensorBinary(HomeSeerDevice):
 
-    pass
+    __slots__ = ()
 
 
 class ZWaveSensorMultilevel(HomeSeerDevice):
 
-    pass
+    __slots__ = ()
 
 
 class ZWaveSwitch(HomeSeerDevice):
+    __slots__ = ()
+
     @property
     def is_on(self):
-        return self.value > self._off_value
+        return self._value > self._off_value
 
     async def on(self):
         params = {
@@ -144,9 +150,11 @@ class ZWaveSwitch(HomeSeerDevice):
 
 
 class ZWaveSwitchMultilevel(ZWaveSwitch):
+    __slots__ = ()
+
     @property
     def dim_percent(self):
-        return self.value / self._on_value
+        return self._value / self._on_value
 
     async def dim(self, percent: int):
         value = int(self._on_value * (percent / 100))
@@ -158,38 +166,25 @@ class ZWaveSwitchMultilevel(ZWaveSwitch):
 
 class ZWaveTemperature(HomeSeerDevice):
 
-    pass
-
-
-def get_zwave_device(raw, control_data, request):
-    device_type = raw["device_type_string"]
-    if device_type == DEVICE_ZWAVE_BARRIER_OPERATOR:
-        return ZWaveBarrierOperator(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_BATTERY:
-        return ZWaveBattery(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_CENTRAL_SCENE:
-        return ZWaveCentralScene(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_DOOR_LOCK:
-        return ZwaveDoorLock(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_FAN_STATE:
-        return ZWaveFanState(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_LUMINANCE:
-        return ZWaveLuminance(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_OPERATING_STATE:
-        return ZWaveOperatingState(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_RELATIVE_HUMIDITY:
-        return ZWaveRelativeHumidity(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_SENSOR_BINARY:
-        return ZWaveSensorBinary(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_SENSOR_MULTILEVEL:
-        return ZWaveSensorMultilevel(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_SWITCH:
-        return ZWaveSwitch(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_SWITCH_BINARY:
-        return ZWaveSwitch(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_SWITCH_MULTILEVEL:
-        return ZWaveSwitchMultilevel(raw, control_data, request)
-    elif device_type == DEVICE_ZWAVE_TEMPERATURE:
-        return ZWaveTemperature(raw, control_data, request)
-    _LOGGER.debug(f"HomeSeer device type not supported: {device_type}")
-    return None
+    __slots__ = ()
+
+
+register_device_class(DEVICE_ZWAVE_BARRIER_OPERATOR, ZWaveBarrierOperator)
+register_device_class(DEVICE_ZWAVE_BATTERY, ZWaveBattery)
+register_device_class(DEVICE_ZWAVE_CENTRAL_SCENE, ZWaveCentralScene)
+register_device_class(DEVICE_ZWAVE_DOOR_LOCK, ZwaveDoorLock)
+register_device_class(DEVICE_ZWAVE_FAN_STATE, ZWaveFanState)
+register_device_class(DEVICE_ZWAVE_LUMINANCE, ZWaveLuminance)
+register_device_class(DEVICE_ZWAVE_OPERATING_STATE, ZWaveOperatingState)
+register_device_class(DEVICE_ZWAVE_RELATIVE_HUMIDITY, ZWaveRelativeHumidity)
+register_device_class(DEVICE_ZWAVE_SENSOR_BINARY, ZWaveSensorBinary)
+register_device_class(DEVICE_ZWAVE_SENSOR_MULTILEVEL, ZWaveSensorMultilevel)
+register_device_class(DEVICE_ZWAVE_SWITCH, ZWaveSwitch)
+register_device_class(DEVICE_ZWAVE_SWITCH_BINARY, ZWaveSwitch)
+register_device_class(DEVICE_ZWAVE_SWITCH_MULTILEVEL, ZWaveSwitchMultilevel)
+register_device_class(DEVICE_ZWAVE_TEMPERATURE, ZWaveTemperature)
+
+
+def get_zwave_device(raw, control_data, request, keep_raw=True):
+    """Kept for compatibility; equivalent to device.get_device."""
+    return get_device(raw, control_data, request, keep_raw)
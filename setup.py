@@ -13,6 +13,7 @@ setuptools.setup(
     url="https://github.com/marthoc/pyhs3",
     packages=['pyhs3'],
     install_requires=['asyncio', 'aiohttp'],
+    extras_require={'fast': ['orjson']},
     classifiers=[
         "Intended Audience :: Developers",
         "Programming Language :: Python",
@@ -0,0 +1,49 @@
+"""Shared fixtures: a HomeTroller connected to the bundled simulator."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from pyhs3 import HomeTroller
+from pyhs3.const import STATE_LISTENING
+from pyhs3.simulator import HomeSeerSimulator
+
+
+async def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        await asyncio.sleep(0.001)
+
+
+@asynccontextmanager
+async def _connected(devices=20, listen=True, simulator=None, **kwargs):
+    sim = HomeSeerSimulator(devices=devices, **(simulator or {}))
+    await sim.start()
+    homeseer = HomeTroller(
+        "127.0.0.1", http_port=sim.http_port, ascii_port=sim.ascii_port, **kwargs
+    )
+    try:
+        await homeseer.initialize()
+        if listen:
+            await homeseer.start_listener()
+            await wait_for(lambda: homeseer.state == STATE_LISTENING)
+            # Let the first ping round trip complete.
+            await asyncio.sleep(0.05)
+        yield sim, homeseer
+    finally:
+        await homeseer.stop_listener()
+        await homeseer.close()
+        await sim.stop()
+
+
+@pytest.fixture
+def connected():
+    """
+    Async context manager factory yielding (simulator, homeseer); simulator is a
+    dict of HomeSeerSimulator options, other kwargs are passed to HomeTroller.
+    """
+    return _connected
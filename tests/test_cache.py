@@ -0,0 +1,65 @@
+"""Tests for the persistent device snapshot."""
+
+import gzip
+import json
+
+from pyhs3 import simulator
+from pyhs3.cache import SNAPSHOT_VERSION, load_snapshot, save_snapshot
+
+
+def _save(path):
+    status = simulator.getstatus(3)
+    for device in status["Devices"]:
+        device["extra"] = "dropped"
+    control = {
+        device["ref"]: device["ControlPairs"]
+        for device in simulator.getcontrol(2)["Devices"]
+    }
+    events = simulator.getevents(2)["Events"]
+    save_snapshot(path, status["Devices"], control, events)
+    return status, control, events
+
+
+def _rewrite(path, **changes):
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        snapshot = json.load(file)
+    snapshot.update(changes)
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        json.dump(snapshot, file)
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "snapshot"
+    status, control, events = _save(path)
+
+    getstatus, getcontrol, getevents = load_snapshot(path, max_age=60)
+    assert [device["ref"] for device in getstatus["Devices"]] == [1, 2, 3]
+    assert "extra" not in getstatus["Devices"][0]
+    assert getstatus["Devices"][1]["value"] == status["Devices"][1]["value"]
+    pairs = {device["ref"]: device["ControlPairs"] for device in getcontrol["Devices"]}
+    assert pairs == control
+    assert getevents["Events"] == events
+    assert not (tmp_path / "snapshot.tmp").exists()
+
+
+def test_version_mismatch(tmp_path):
+    path = tmp_path / "snapshot"
+    _save(path)
+    _rewrite(path, version=SNAPSHOT_VERSION + 1)
+    assert load_snapshot(path, max_age=60) is None
+
+
+def test_too_old(tmp_path):
+    path = tmp_path / "snapshot"
+    _save(path)
+    assert load_snapshot(path, max_age=-1) is None
+
+
+def test_missing(tmp_path):
+    assert load_snapshot(tmp_path / "snapshot", max_age=60) is None
+
+
+def test_corrupt(tmp_path):
+    path = tmp_path / "snapshot"
+    path.write_bytes(b"not a snapshot")
+    assert load_snapshot(path, max_age=60) is None
@@ -0,0 +1,71 @@
+"""Tests for capturing and replaying HomeSeer traffic."""
+
+import asyncio
+
+from pyhs3 import HomeTroller
+from pyhs3.capture import (
+    CAPTURE_ASCII,
+    CAPTURE_JSON,
+    CaptureReplay,
+    CaptureWriter,
+    read_capture,
+)
+
+from conftest import wait_for
+
+
+def test_write_and_read_records(tmp_path):
+    path = tmp_path / "capture"
+    writer = CaptureWriter(path)
+    writer.write_ascii(b"DC,1,5,0\r\n")
+    writer.write_json("getstatus", b'{"Devices": []}')
+    writer.close()
+
+    records = [(kind, payload) for _, kind, payload in read_capture(path)]
+    assert records == [
+        (CAPTURE_ASCII, b"DC,1,5,0\r\n"),
+        (CAPTURE_JSON, b'getstatus\0{"Devices": []}'),
+    ]
+
+
+def test_truncated_record_is_ignored(tmp_path):
+    path = tmp_path / "capture"
+    writer = CaptureWriter(path)
+    writer.write_ascii(b"DC,1,5,0\r\n")
+    writer.write_ascii(b"DC,2,6,0\r\n")
+    writer.close()
+    path.write_bytes(path.read_bytes()[:-3])
+
+    assert [payload for _, _, payload in read_capture(path)] == [b"DC,1,5,0\r\n"]
+
+
+def test_replay_reproduces_session(connected, tmp_path):
+    path = tmp_path / "capture"
+
+    async def record():
+        async with connected(capture_path=str(path)) as (sim, homeseer):
+            for value in range(10, 15):
+                sim.set_value(1, value)
+            sim.set_value(2, 42)
+            await wait_for(lambda: homeseer.devices[2].value == 42)
+            return {ref: device.value for ref, device in homeseer.devices.items()}
+
+    async def replay():
+        capture = CaptureReplay(path)
+        homeseer = HomeTroller("192.0.2.1", transport=capture.transport)
+        updates = []
+        homeseer.add_update_listener(
+            lambda device, old_value, reason: updates.append(device.ref)
+        )
+        await capture.run(homeseer)
+        assert updates == [1, 1, 1, 1, 1, 2]
+        # Commands during replay go to the capture transport, not the network.
+        assert await homeseer.control_device_by_value(1, 99)
+        await homeseer.close()
+        return capture, {ref: device.value for ref, device in homeseer.devices.items()}
+
+    recorded = asyncio.run(record())
+    capture, replayed = asyncio.run(replay())
+    assert replayed == recorded
+    assert capture.message_count >= 6
+
@@ -0,0 +1,53 @@
+"""Tests for per-device update coalescing."""
+
+import asyncio
+
+from pyhs3.const import DEVICE_ZWAVE_SWITCH_BINARY
+
+from conftest import wait_for
+
+
+def collect(homeseer):
+    updates = []
+    homeseer.add_update_listener(
+        lambda device, old_value, reason: updates.append((device.ref, device.value))
+    )
+    return updates
+
+
+def test_window_delivers_first_and_latest(connected):
+    async def scenario():
+        async with connected(coalesce_window=0.05) as (sim, homeseer):
+            updates = collect(homeseer)
+            for value in range(10, 15):
+                sim.set_value(1, value)
+            await wait_for(lambda: updates == [(1, 10), (1, 14)])
+            await asyncio.sleep(0.1)
+            assert updates == [(1, 10), (1, 14)]
+            assert homeseer.devices[1].value == 14
+
+    asyncio.run(scenario())
+
+
+def test_windows_per_device_type(connected):
+    async def scenario():
+        # Ref 1 is a binary switch, ref 2 a binary sensor.
+        async with connected(
+            coalesce_windows={DEVICE_ZWAVE_SWITCH_BINARY: 0.05}
+        ) as (sim, homeseer):
+            updates = collect(homeseer)
+            for value in range(10, 13):
+                sim.set_value(1, value)
+                sim.set_value(2, value)
+            await wait_for(lambda: (1, 12) in updates)
+            assert [update for update in updates if update[0] == 1] == [
+                (1, 10),
+                (1, 12),
+            ]
+            assert [update for update in updates if update[0] == 2] == [
+                (2, 10),
+                (2, 11),
+                (2, 12),
+            ]
+
+    asyncio.run(scenario())
@@ -0,0 +1,71 @@
+"""Tests for the controldevicebyvalue command queue."""
+
+import asyncio
+
+from pyhs3.commands import CommandQueue
+
+
+class FakeRequest:
+    def __init__(self):
+        self.sent = []
+        self.release = None
+
+    async def __call__(self, method, params=None):
+        if self.release is not None:
+            await self.release.wait()
+        self.sent.append((params["ref"], params["value"]))
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    errors = []
+    loop.set_exception_handler(lambda loop, context: errors.append(context))
+    try:
+        loop.run_until_complete(coro)
+    finally:
+        loop.close()
+    return errors
+
+
+def test_supersede_after_caller_cancelled():
+    async def scenario():
+        request = FakeRequest()
+        commands = CommandQueue(request, window=0.01)
+        first = commands.submit(1, 10)
+        first.cancel()
+        second = commands.submit(1, 20)
+        assert await second is True
+        assert request.sent == [(1, 20)]
+
+    assert run(scenario()) == []
+
+
+def test_caller_timeout_while_sending():
+    async def scenario():
+        request = FakeRequest()
+        request.release = asyncio.Event()
+        commands = CommandQueue(request)
+        future = commands.submit(1, 10)
+        try:
+            await asyncio.wait_for(future, 0.01)
+        except asyncio.TimeoutError:
+            pass
+        request.release.set()
+        await asyncio.sleep(0.01)
+        assert request.sent == [(1, 10)]
+        assert not commands._tasks
+
+    assert run(scenario()) == []
+
+
+def test_last_write_wins():
+    async def scenario():
+        request = FakeRequest()
+        commands = CommandQueue(request, window=0.01)
+        first = commands.submit(1, 10)
+        second = commands.submit(1, 20)
+        assert await first is False
+        assert await second is True
+        assert request.sent == [(1, 20)]
+
+    assert run(scenario()) == []
@@ -0,0 +1,75 @@
+"""Tests for loading and reloading devices."""
+
+import asyncio
+
+from pyhs3.const import DEVICE_ZWAVE_SWITCH_MULTILEVEL
+
+from conftest import wait_for
+
+
+def test_reload_keeps_renamed_device(connected):
+    async def scenario():
+        async with connected(listen=False) as (sim, homeseer):
+            device = homeseer.devices[1]
+            calls = []
+            device.register_update_callback(lambda: calls.append(device.name))
+            sim._devices[1]["name"] = "Renamed"
+            sim._devices[1]["location"] = "Attic"
+
+            await homeseer._fetch_all()
+            assert homeseer.devices[1] is device
+            assert (device.name, device.location) == ("Renamed", "Attic")
+            assert calls == ["Renamed"]
+
+    asyncio.run(scenario())
+
+
+def test_reload_keeps_callback_on_type_change(connected):
+    async def scenario():
+        async with connected(listen=False) as (sim, homeseer):
+            calls = []
+            homeseer.devices[1].register_update_callback(lambda: calls.append(1))
+            sim._devices[1]["device_type_string"] = DEVICE_ZWAVE_SWITCH_MULTILEVEL
+
+            await homeseer._fetch_all()
+            device = homeseer.devices[1]
+            assert device.device_type_string == DEVICE_ZWAVE_SWITCH_MULTILEVEL
+            device.update_value(5)
+            assert calls == [1]
+
+    asyncio.run(scenario())
+
+
+def test_coalesced_update_for_removed_device(connected):
+    async def scenario():
+        async with connected(coalesce_window=0.05) as (sim, homeseer):
+            sim.set_value(1, 5)
+            sim.set_value(1, 6)
+            await wait_for(lambda: homeseer._coalesce_pending)
+            del homeseer.devices[1]
+
+            errors = []
+            loop = asyncio.get_event_loop()
+            loop.set_exception_handler(lambda loop, context: errors.append(context))
+            await asyncio.sleep(0.1)
+            assert errors == []
+            assert not homeseer._coalesce_timers
+
+    asyncio.run(scenario())
+
+
+def test_non_numeric_value(connected):
+    async def scenario():
+        async with connected(listen=False) as (sim, homeseer):
+            count = len(homeseer.devices)
+            sim._devices[1]["value"] = ""
+            sim._devices[2]["value"] = "Unknown"
+            sim._devices[3]["value"] = "12.5"
+
+            await homeseer._fetch_all()
+            assert len(homeseer.devices) == count
+            assert homeseer.devices[1].value == ""
+            assert homeseer.devices[2].value == "Unknown"
+            assert homeseer.devices[3].value == 12.5
+
+    asyncio.run(scenario())
@@ -0,0 +1,89 @@
+"""Tests for the listener's bounded update queue."""
+
+import asyncio
+
+import pytest
+
+from pyhs3.const import OVERFLOW_BACKPRESSURE, OVERFLOW_COALESCE, OVERFLOW_DROP_OLDEST
+from pyhs3.dispatch import UpdateQueue
+
+
+def test_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        UpdateQueue(10, "discard")
+
+
+def test_backpressure_waits_for_space():
+    async def scenario():
+        queue = UpdateQueue(2, OVERFLOW_BACKPRESSURE)
+        await queue.put(1, "a")
+        await queue.put(2, "b")
+        put = asyncio.ensure_future(queue.put(3, "c"))
+        await asyncio.sleep(0.01)
+        assert not put.done()
+
+        assert await queue.get() == (1, "a")
+        await asyncio.wait_for(put, 1)
+        assert [await queue.get(), await queue.get()] == [(2, "b"), (3, "c")]
+        assert queue.as_dict() == {"depth": 0, "dropped": 0, "coalesced": 0}
+
+    asyncio.run(scenario())
+
+
+def test_drop_oldest():
+    async def scenario():
+        queue = UpdateQueue(2, OVERFLOW_DROP_OLDEST)
+        for ref in (1, 2, 3):
+            await queue.put(ref, str(ref))
+        assert [await queue.get(), await queue.get()] == [(2, "2"), (3, "3")]
+        assert queue.dropped == 1
+
+    asyncio.run(scenario())
+
+
+def test_coalesce_keeps_latest_value_per_ref():
+    async def scenario():
+        queue = UpdateQueue(2, OVERFLOW_COALESCE)
+        await queue.put(1, "a")
+        await queue.put(1, "b")
+        await queue.put(2, "c")
+        assert len(queue) == 2
+        assert [await queue.get(), await queue.get()] == [(1, "b"), (2, "c")]
+        assert queue.coalesced == 1
+
+    asyncio.run(scenario())
+
+
+def test_join_waits_for_task_done():
+    async def scenario():
+        queue = UpdateQueue(10)
+        await queue.join()
+        await queue.put(1, "a")
+        await queue.put(2, "b")
+        join = asyncio.ensure_future(queue.join())
+
+        await queue.get()
+        queue.task_done()
+        await asyncio.sleep(0.01)
+        assert not join.done()
+
+        await queue.get()
+        queue.task_done()
+        await asyncio.wait_for(join, 1)
+
+    asyncio.run(scenario())
+
+
+def test_clear_releases_join_and_put():
+    async def scenario():
+        queue = UpdateQueue(1)
+        await queue.put(1, "a")
+        put = asyncio.ensure_future(queue.put(2, "b"))
+        await asyncio.sleep(0.01)
+        queue.clear()
+        await asyncio.wait_for(put, 1)
+        assert await queue.get() == (2, "b")
+        queue.task_done()
+        await asyncio.wait_for(queue.join(), 1)
+
+    asyncio.run(scenario())
@@ -0,0 +1,91 @@
+"""Tests for the ASCII listener lifecycle."""
+
+import asyncio
+
+from pyhs3.const import STATE_STOPPED
+from pyhs3.listener import parse_device_change
+
+from conftest import wait_for
+
+
+def test_parse_device_change():
+    assert parse_device_change(b"DC,12,55,0\r\n") == (12, "55")
+    assert parse_device_change(b"DC,12,5.5,0\r\n") == (12, "5.5")
+    assert parse_device_change(b"DC,x,1,0\r\n") is None
+    assert parse_device_change(b"DC,12\r\n") is None
+    assert parse_device_change(b"3.0.0.548\r\n") is None
+
+
+def test_updates_dispatched_in_order(connected):
+    async def scenario():
+        async with connected() as (sim, homeseer):
+            values = []
+            homeseer.add_update_listener(
+                lambda device, old_value, reason: values.append(device.value)
+            )
+            for value in range(50):
+                sim.set_value(1, value)
+            await wait_for(lambda: len(values) == 50)
+            assert values == list(range(50))
+
+    asyncio.run(scenario())
+
+
+def test_stop_notifies_disconnect(connected):
+    async def scenario():
+        async with connected() as (sim, homeseer):
+            calls = []
+            homeseer.devices[1].register_update_callback(lambda: calls.append(1))
+            await homeseer.stop_listener()
+            assert calls == [1]
+            assert homeseer.state == STATE_STOPPED
+            assert homeseer._listener.closed
+
+    asyncio.run(scenario())
+
+
+def test_stop_cancels_timers(connected):
+    async def scenario():
+        async with connected(
+            coalesce_window=10, optimistic_timeout=10, simulator={"confirm_delay": None}
+        ) as (sim, homeseer):
+            sim.set_value(3, 5)
+            sim.set_value(3, 6)
+            await wait_for(lambda: homeseer._coalesce_pending)
+            await homeseer.control_device_by_value(1, 42)
+            timers = list(homeseer._coalesce_timers.values())
+            timers += [pending[3] for pending in homeseer._optimistic.values()]
+            assert len(timers) == 2
+
+            await homeseer.stop_listener()
+            assert all(timer.cancelled() for timer in timers)
+            assert not homeseer._coalesce_timers
+            assert not homeseer._optimistic
+
+    asyncio.run(scenario())
+
+
+def test_task_count_constant_across_reconnects(connected):
+    def listener_tasks():
+        return sum(
+            1
+            for task in asyncio.all_tasks()
+            if task.get_coro().__qualname__.startswith("ASCIIListener.")
+        )
+
+    async def scenario():
+        async with connected() as (sim, homeseer):
+            counts = set()
+            for _ in range(20):
+                reconnects = homeseer.reconnect_metrics["reconnects"]
+                sim.drop_clients()
+                await wait_for(
+                    lambda: homeseer.reconnect_metrics["reconnects"] > reconnects
+                )
+                await asyncio.sleep(0.01)
+                counts.add(listener_tasks())
+            assert counts == {3}
+            await homeseer.stop_listener()
+            assert listener_tasks() == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,35 @@
+"""Tests for HomeTrollerManager."""
+
+import asyncio
+
+from pyhs3.const import STATE_STOPPED
+from pyhs3.manager import HomeTrollerManager
+from pyhs3.simulator import HomeSeerSimulator
+
+
+def test_remove_controller_while_starting():
+    async def scenario():
+        sim = HomeSeerSimulator(devices=5, latency=0.2)
+        await sim.start()
+        manager = HomeTrollerManager(stagger=0)
+        homeseer = manager.add_controller(
+            "site", "127.0.0.1", http_port=sim.http_port, ascii_port=sim.ascii_port
+        )
+        starting = asyncio.get_event_loop().create_task(manager.start())
+        await asyncio.sleep(0.05)
+        task = manager._tasks["site"]
+
+        await manager.remove_controller("site")
+        # The start task has finished unwinding, so it cannot start the listener
+        # on the closed controller.
+        assert task.cancelled()
+        await asyncio.sleep(0.3)
+        assert homeseer.state == STATE_STOPPED
+        assert not homeseer.devices
+
+        starting.cancel()
+        await asyncio.gather(starting, return_exceptions=True)
+        await manager.stop()
+        await sim.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,127 @@
+"""Tests for optimistic device commands."""
+
+import asyncio
+from json import dumps
+
+import pytest
+
+from pyhs3 import HomeTroller
+from pyhs3.const import REASON_OPTIMISTIC, REASON_ROLLED_BACK
+from pyhs3.simulator import getcontrol, getstatus
+
+from conftest import wait_for
+
+SWITCH = "Z-Wave Switch Binary"
+
+
+def confirmed(homeseer):
+    return homeseer.command_metrics.get(SWITCH, {}).get("confirmed")
+
+
+def test_confirmed_by_dc(connected):
+    async def scenario():
+        async with connected(
+            simulator={"confirm_delay": 0.05}, optimistic_timeout=1
+        ) as (sim, homeseer):
+            updates = []
+            homeseer.add_update_listener(
+                lambda device, old_value, reason: updates.append((device.value, reason))
+            )
+            await homeseer.control_device_by_value(1, 42)
+            assert homeseer.devices[1].value == 42
+            await wait_for(lambda: confirmed(homeseer))
+            assert homeseer.devices[1].value == 42
+            assert updates == [(42, REASON_OPTIMISTIC)]
+
+    asyncio.run(scenario())
+
+
+def test_mismatched_dc(connected):
+    async def scenario():
+        async with connected(
+            simulator={"confirm_delay": None}, optimistic_timeout=1
+        ) as (sim, homeseer):
+            await homeseer.control_device_by_value(1, 42)
+            sim.set_value(1, 50)
+            await wait_for(lambda: homeseer.devices[1].value == 50)
+            metrics = homeseer.command_metrics[SWITCH]
+            assert metrics["mismatched"] == 1
+            assert metrics["confirmed"] == 0
+            await asyncio.sleep(0.05)
+            assert homeseer.devices[1].value == 50
+
+    asyncio.run(scenario())
+
+
+def test_rolled_back_after_timeout(connected):
+    async def scenario():
+        async with connected(
+            simulator={"confirm_delay": None}, optimistic_timeout=0.05
+        ) as (sim, homeseer):
+            updates = []
+            homeseer.add_update_listener(
+                lambda device, old_value, reason: updates.append((device.value, reason))
+            )
+            await homeseer.control_device_by_value(1, 42)
+            await asyncio.sleep(0.1)
+            assert homeseer.devices[1].value == 1
+            assert updates == [(42, REASON_OPTIMISTIC), (1, REASON_ROLLED_BACK)]
+            assert homeseer.command_metrics[SWITCH]["timed_out"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_stale_refresh_does_not_hide_confirmation(connected):
+    async def scenario():
+        async with connected(
+            simulator={"confirm_delay": 0.1}, optimistic_timeout=1
+        ) as (sim, homeseer):
+            await homeseer.control_device_by_value(1, 42)
+            # The simulator only applies the command with its DC message, so this
+            # getstatus still reports the old value.
+            await homeseer.refresh_devices()
+            assert homeseer.devices[1].value == 42
+            await wait_for(lambda: confirmed(homeseer))
+            assert homeseer.devices[1].value == 42
+
+    asyncio.run(scenario())
+
+
+def test_refresh_confirms_lost_dc(connected):
+    async def scenario():
+        async with connected(
+            simulator={"confirm_delay": None}, optimistic_timeout=0.1
+        ) as (sim, homeseer):
+            await homeseer.control_device_by_value(1, 42)
+            await homeseer.refresh_devices()
+            await asyncio.sleep(0.15)
+            assert homeseer.devices[1].value == 42
+            assert homeseer.command_metrics[SWITCH]["confirmed"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_send_error_after_resolution():
+    async def scenario():
+        homeseer = None
+
+        async def transport(method, params=None, json=None, raise_errors=False):
+            request = params["request"]
+            if request == "getstatus":
+                return dumps(getstatus(5)).encode()
+            if request == "getcontrol":
+                return dumps(getcontrol(5)).encode()
+            if request == "getevents":
+                return b'{"Events": []}'
+            # The DC arrives (resolving the command) before the send fails.
+            await homeseer._update_device_value(params["ref"], str(params["value"]))
+            raise RuntimeError("send failed")
+
+        homeseer = HomeTroller("127.0.0.1", transport=transport, optimistic_timeout=1)
+        await homeseer.initialize()
+        with pytest.raises(RuntimeError):
+            await homeseer.control_device_by_value(1, 42)
+        assert homeseer.devices[1].value == 42
+
+    asyncio.run(scenario())
+
@@ -0,0 +1,46 @@
+"""Tests for getstatus reconciliation while listening."""
+
+import asyncio
+
+from pyhs3.const import REASON_RECONCILED
+
+from conftest import wait_for
+
+
+def test_dc_updates_are_not_drift(connected):
+    async def scenario():
+        async with connected(reconcile_min_interval=0.05) as (sim, homeseer):
+            for ref in range(1, 6):
+                sim.set_value(ref, 50 + ref)
+            await wait_for(lambda: homeseer.devices[5].value == 55)
+            await asyncio.sleep(0.2)
+            assert not homeseer.drift_counts
+
+    asyncio.run(scenario())
+
+
+def test_missed_update_is_drift(connected):
+    async def scenario():
+        async with connected(reconcile_min_interval=0.05) as (sim, homeseer):
+            sim.set_value(2, 9, notify=False)
+            await wait_for(lambda: homeseer.devices[2].value == 9)
+            assert homeseer.drift_counts == {"Z-Wave Sensor Binary": 1}
+
+    asyncio.run(scenario())
+
+
+def test_dc_during_poll_is_kept(connected):
+    async def scenario():
+        async with connected(simulator={"latency": 0.1}) as (sim, homeseer):
+            refresh = asyncio.ensure_future(
+                homeseer.refresh_devices(reason=REASON_RECONCILED)
+            )
+            await asyncio.sleep(0.02)
+            # Arrives after getstatus was answered, so the response is older.
+            sim.set_value(1, 77)
+            await wait_for(lambda: homeseer.devices[1].value == 77)
+            changed = await refresh
+            assert 1 not in changed
+            assert homeseer.devices[1].value == 77
+
+    asyncio.run(scenario())
@@ -0,0 +1,84 @@
+"""Tests for diffing and selective getstatus refreshes."""
+
+import asyncio
+from collections import Counter
+
+from pyhs3 import MetricsHook
+from pyhs3.const import DEVICE_ZWAVE_SENSOR_BINARY
+
+
+class RequestCounter(MetricsHook):
+    def __init__(self):
+        self.requests = Counter()
+
+    def request_completed(self, request_type, latency):
+        self.requests[request_type] += 1
+
+
+def test_refresh_returns_and_notifies_only_changes(connected):
+    async def scenario():
+        async with connected(listen=False) as (sim, homeseer):
+            updated = []
+            homeseer.add_update_listener(
+                lambda device, old_value, reason: updated.append(device.ref)
+            )
+            sim.set_value(3, 30, notify=False)
+            sim.set_value(5, 50, notify=False)
+
+            assert await homeseer.refresh_devices() == {3: (3, 30), 5: (5, 50)}
+            assert updated == [3, 5]
+            assert await homeseer.refresh_devices() == {}
+
+    asyncio.run(scenario())
+
+
+def test_refresh_by_ref_location_and_type(connected):
+    async def scenario():
+        async with connected(devices=30, listen=False) as (sim, homeseer):
+            for ref in (1, 2, 21):
+                sim.set_value(ref, 77, notify=False)
+
+            # Refs 1 and 21 are in "Room 1"; ref 2 is a binary sensor.
+            assert await homeseer.refresh_devices(location="Room 1") == {
+                1: (1, 77),
+                21: (21, 77),
+            }
+            assert await homeseer.refresh_devices(
+                refs=[2, 3], device_type=DEVICE_ZWAVE_SENSOR_BINARY
+            ) == {2: (2, 77)}
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_ref_refreshes_are_batched(connected):
+    async def scenario():
+        hook = RequestCounter()
+        async with connected(listen=False, metrics=hook) as (sim, homeseer):
+            sim.set_value(1, 11, notify=False)
+            sim.set_value(3, 33, notify=False)
+            hook.requests.clear()
+
+            results = await asyncio.gather(
+                homeseer.refresh_devices(refs=[1]),
+                homeseer.refresh_devices(refs=[3]),
+                homeseer.refresh_devices(refs=[4]),
+            )
+            assert results == [{1: (1, 11)}, {3: (3, 33)}, {}]
+            assert hook.requests["getstatus"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_empty_refs_sends_no_request(connected):
+    async def scenario():
+        hook = RequestCounter()
+        async with connected(listen=False, metrics=hook) as (sim, homeseer):
+            hook.requests.clear()
+            assert await homeseer.refresh_devices(refs=[]) == {}
+            assert await homeseer.refresh_devices(refs=iter(())) == {}
+            assert await homeseer.refresh_devices(
+                refs=[1], device_type="Unknown type"
+            ) == {}
+            assert hook.requests["getstatus"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,65 @@
+"""Tests for streaming device update subscriptions."""
+
+import asyncio
+
+from pyhs3.const import DEVICE_ZWAVE_SENSOR_BINARY
+
+
+def test_filters_by_ref_and_type(connected):
+    async def scenario():
+        async with connected() as (sim, homeseer):
+            by_ref = homeseer.subscribe(refs=[1])
+            by_type = homeseer.subscribe(types=[DEVICE_ZWAVE_SENSOR_BINARY])
+            everything = homeseer.subscribe()
+            sim.set_value(1, 10)
+            sim.set_value(2, 20)
+
+            update = await asyncio.wait_for(by_ref.__anext__(), 1)
+            assert (update.ref, update.old_value, update.new_value) == (1, 1, 10)
+            update = await asyncio.wait_for(by_type.__anext__(), 1)
+            assert (update.ref, update.new_value) == (2, 20)
+            refs = [(await asyncio.wait_for(everything.__anext__(), 1)).ref]
+            refs.append((await asyncio.wait_for(everything.__anext__(), 1)).ref)
+            assert refs == [1, 2]
+
+            await asyncio.sleep(0.05)
+            assert not by_ref._updates and not by_type._updates
+
+    asyncio.run(scenario())
+
+
+def test_drops_oldest_when_full(connected):
+    async def scenario():
+        async with connected() as (sim, homeseer):
+            subscription = homeseer.subscribe(refs=[1], maxsize=2)
+            for value in range(10, 15):
+                sim.set_value(1, value)
+            await asyncio.sleep(0.05)
+            assert subscription.dropped == 3
+            values = [(await subscription.__anext__()).new_value for _ in range(2)]
+            assert values == [13, 14]
+
+    asyncio.run(scenario())
+
+
+def test_close_ends_iteration(connected):
+    async def scenario():
+        async with connected() as (sim, homeseer):
+            received = []
+
+            async def consume(subscription):
+                async for update in subscription:
+                    received.append(update.new_value)
+
+            async with homeseer.subscribe(refs=[1]) as subscription:
+                consumer = asyncio.ensure_future(consume(subscription))
+                sim.set_value(1, 10)
+                await asyncio.sleep(0.05)
+            await asyncio.wait_for(consumer, 1)
+            assert received == [10]
+
+            sim.set_value(1, 11)
+            await asyncio.sleep(0.05)
+            assert not homeseer._ref_subscriptions.get(1)
+
+    asyncio.run(scenario())